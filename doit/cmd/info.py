@@ -61,7 +61,8 @@ class Info(DoitCmdBase):
         # print reason task is not up-to-date
         retcode = 0
         if not hide_status:
-            status = self.dep_manager.get_status(task, tasks, get_log=True)
+            status = self.dep_manager.get_status(
+                task, tasks, get_log=True, save_digests=False)
             self.outstream.write('\n{:11s}: {}\n'
                                  .format('status', status.status))
             if status.status != 'up-to-date':
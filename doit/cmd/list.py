@@ -90,7 +90,8 @@ class List(DoitCmdBase):
             if self.dep_manager.status_is_ignore(task):
                 task_status = 'ignore'
             else:
-                task_status = self.dep_manager.get_status(task, tasks).status
+                task_status = self.dep_manager.get_status(
+                    task, tasks, save_digests=False).status
             line_data['status'] = self.STATUS_MAP[task_status]
 
         self.outstream.write(template.format(**line_data))
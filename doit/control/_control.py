@@ -336,9 +336,26 @@ class TaskDispatcher(object):
         self.waiting = set()  # of ExecNode
         self.ready = deque()  # of ExecNode
 
+        # selected task names not dispatched yet (last one is next)
+        self._tasks_to_run = list(reversed(selected_tasks or ()))
         self.generator = self._dispatcher_generator(selected_tasks)
 
 
+    def has_pending(self):
+        """Return True if tasks might still be dispatched.
+
+        Selected tasks already dispatched as a dependency of another task
+        are dropped from the queue here, as the generator would do.
+        """
+        if self.ready or self.waiting:
+            return True
+        tasks_to_run = self._tasks_to_run
+        nodes = self.nodes
+        while tasks_to_run and tasks_to_run[-1] in nodes:
+            tasks_to_run.pop()
+        return bool(tasks_to_run)
+
+
     def inject_task(self, task_name):
         """Inject a task to be executed during the current dispatch.
 
@@ -600,7 +617,7 @@ class TaskDispatcher(object):
         """return generator dispatching tasks"""
         # each selected task will create a tree (from dependencies) of
         # tasks to be processed
-        tasks_to_run = list(reversed(selected_tasks))
+        tasks_to_run = self._tasks_to_run
         node = None  # current active ExecNode
 
         while True:
@@ -2,6 +2,7 @@
 
 import os
 import hashlib
+import mmap
 import subprocess
 import inspect
 import json
@@ -56,6 +57,10 @@ class StorageKey:
     DEPS = 'deps:'
     # Task ignore flag
     IGNORE = 'ignore:'
+    # Prefix of the pseudo task ids (FILE_DIGESTS + file_key) holding a
+    # file's content digests shared by all tasks:
+    # {checker: (st_mtime_ns, st_size, digest)}
+    FILE_DIGESTS = '_file_digests_'
 
 
 class DatabaseException(Exception):
@@ -69,21 +74,74 @@ def get_md5(input_data):
     return hashlib.md5(byte_data).hexdigest()
 
 
-def get_file_md5(path):
-    """Calculate the md5 sum from file content.
+def _hash_file(path, new_hash):
+    """Return the hex digest of a file's content.
 
     @param path: (string) file path
-    @return: (string) md5
+    @param new_hash: callable returning a new hashlib hash object
     """
     with open(path, 'rb') as file_data:
-        md5 = hashlib.md5()
-        block_size = 128 * md5.block_size
+        # hash the whole mapped file in a single C call
+        try:
+            with mmap.mmap(file_data.fileno(), 0,
+                           access=mmap.ACCESS_READ) as content:
+                return new_hash(content).hexdigest()
+        except (ValueError, OSError):
+            # empty files and some special files can not be mapped
+            pass
+        if hasattr(hashlib, 'file_digest'):  # python 3.11+
+            return hashlib.file_digest(file_data, new_hash).hexdigest()
+        file_hash = new_hash()
+        block_size = 128 * file_hash.block_size
         while True:
             data = file_data.read(block_size)
             if not data:
                 break
-            md5.update(data)
-    return md5.hexdigest()
+            file_hash.update(data)
+    return file_hash.hexdigest()
+
+
+def get_file_md5(path):
+    """Calculate the md5 sum from file content.
+
+    @param path: (string) file path
+    @return: (string) md5
+    """
+    return _hash_file(path, hashlib.md5)
+
+
+def _blake2b_128(data=b''):
+    return hashlib.blake2b(data, digest_size=16)
+
+
+def get_file_blake2(path):
+    """Calculate a 128 bit BLAKE2b hash from file content.
+
+    BLAKE2b is part of hashlib and faster than md5 on 64 bit CPUs.
+
+    @param path: (string) file path
+    @return: (string) hex digest
+    """
+    return _hash_file(path, _blake2b_128)
+
+
+def get_file_blake3(path):
+    """Calculate the BLAKE3 hash from file content.
+
+    Requires the optional ``blake3`` package.
+
+    @param path: (string) file path
+    @return: (string) hex digest
+    """
+    try:
+        import blake3
+    except ImportError:
+        raise ImportError(
+            "blake3 required for checker='blake3'. Install: pip install blake3"
+        )
+    hasher = blake3.blake3(max_threads=blake3.blake3.AUTO)
+    hasher.update_mmap(path)
+    return hasher.hexdigest()
 
 
 class JSONCodec():
@@ -672,21 +730,22 @@ class TaskState:
 
         # Save dependencies (Dependency objects)
         # Late import to avoid circular dependency
-        from doit.deps import TaskDependency
+        from doit.deps import TaskDependency, stat_cache
 
         dep_keys = []
-        for dep in task.dependencies:
-            # TaskDependency has no state to save
-            if isinstance(dep, TaskDependency):
-                continue
+        with stat_cache(self.store):
+            for dep in task.dependencies:
+                # TaskDependency has no state to save
+                if isinstance(dep, TaskDependency):
+                    continue
 
-            key = dep.get_key()
-            dep_keys.append(key)
+                key = dep.get_key()
+                dep_keys.append(key)
 
-            current_state = self.store.get(task.name, key)
-            new_state = dep.get_state(current_state)
-            if new_state is not None:
-                self.store.set(task.name, key, new_state)
+                current_state = self.store.get(task.name, key)
+                new_state = dep.get_state(current_state)
+                if new_state is not None:
+                    self.store.set(task.name, key, new_state)
 
         self.store.set(task.name, StorageKey.DEPS, tuple(dep_keys))
 
@@ -759,7 +818,8 @@ class UpToDateChecker:
         self.store = store
         self.checker = checker
 
-    def check(self, task, tasks_dict, get_values_func, get_log=False):
+    def check(self, task, tasks_dict, get_values_func, get_log=False,
+              save_digests=True):
         """Check if task is up to date. Sets task.dep_changed.
 
         If the checker class changed since the previous run, the task is
@@ -769,6 +829,8 @@ class UpToDateChecker:
         @param tasks_dict: dict of all tasks (passed to uptodate callables)
         @param get_values_func: function(task_name) -> dict of values
         @param get_log: if True, adds all reasons to result object
+        @param save_digests: if False, file digests computed by the check
+            are not saved in the store
         @return: DependencyStatus with status 'up-to-date', 'run', or 'error'
         """
         result = DependencyStatus(get_log)
@@ -861,26 +923,36 @@ class UpToDateChecker:
                 result.set_reason(DependencyReason.REMOVED_FILE_DEP, removed_files)
             result.status = 'run'
 
-        # Check dependencies using self-checking Dependency objects
-        from doit.deps import CheckStatus
+        # Check dependencies using self-checking Dependency objects, grouped
+        # by type: each class's check_status_batch() may share work within
+        # its group (e.g. files whose digest must be recomputed are hashed
+        # in parallel).
+        from doit.deps import stat_cache
         changed = []
-        for dep in task.dependencies:
+        with stat_cache(self.store, save_digests):
             # TaskDependency doesn't affect up-to-date status
-            if isinstance(dep, TaskDependency):
-                continue
-
-            key = dep.get_key()
-            stored_state = self.store.get(task.name, key)
-
-            # Use dependency's self-checking method
-            check_result = dep.check_status(stored_state)
-
-            if check_result.is_error:
-                result.error_reason = check_result.error_message
-                if result.add_reason(DependencyReason.MISSING_FILE_DEP, key, 'error'):
-                    return result
-            elif check_result.needs_execution:
-                changed.append(key)
+            checked = [dep for dep in task.dependencies
+                       if not isinstance(dep, TaskDependency)]
+            by_type = defaultdict(list)
+            for idx, dep in enumerate(checked):
+                state = self.store.get(task.name, dep.get_key())
+                by_type[type(dep)].append((idx, dep, state))
+            check_results = [None] * len(checked)
+            for dep_type, group in by_type.items():
+                batch = dep_type.check_status_batch(
+                    [(dep, state) for _, dep, state in group])
+                for (idx, _, _), check_result in zip(group, batch):
+                    check_results[idx] = check_result
+
+            for dep, check_result in zip(checked, check_results):
+                key = dep.get_key()
+                if check_result.is_error:
+                    result.error_reason = check_result.error_message
+                    if result.add_reason(DependencyReason.MISSING_FILE_DEP,
+                                         key, 'error'):
+                        return result
+                elif check_result.needs_execution:
+                    changed.append(key)
 
         task.dep_changed = changed
 
@@ -968,7 +1040,6 @@ class Dependency(object):
         # Expose low-level backend access for backward compatibility
         self._set = self.backend.set
         self._get = self.backend.get
-        self.remove = self.backend.remove
         self.remove_all = self.backend.remove_all
         self._in = self.backend.in_
         self.name = self.backend.name
@@ -1013,6 +1084,18 @@ class Dependency(object):
         """Remove saved info from task."""
         return self._task_state.remove_success(task)
 
+    def remove(self, task_id):
+        """Remove saved info from task (forget it).
+
+        The stored digests of the task's file dependencies are dropped as
+        well, so entries of files no longer used do not pile up. These
+        files are hashed again on their next check.
+        """
+        dep_keys = self.backend.get(task_id, StorageKey.DEPS) or ()
+        self.backend.remove(task_id)
+        for key in dep_keys:
+            self.backend.remove(StorageKey.FILE_DIGESTS + key)
+
     def ignore(self, task):
         """Mark task to be ignored."""
         return self._task_state.set_ignore(task)
@@ -1023,16 +1106,18 @@ class Dependency(object):
 
     # --- Delegate to UpToDateChecker ---
 
-    def get_status(self, task, tasks_dict, get_log=False):
+    def get_status(self, task, tasks_dict, get_log=False, save_digests=True):
         """Check if task is up to date. Sets task.dep_changed.
 
         @param task: (Task)
         @param tasks_dict: (dict: Task) passed to objects used on uptodate
         @param get_log: (bool) if True, adds all reasons to the return object
+        @param save_digests: (bool) if False, file digests computed by the
+            check are not saved (for commands that only report status)
         @return: (DependencyStatus) with status 'up-to-date', 'run', or 'error'
         """
         return self._uptodate_checker.check(
-            task, tasks_dict, self.get_values, get_log
+            task, tasks_dict, self.get_values, get_log, save_digests
         )
 
 
@@ -277,9 +277,8 @@ class TaskIterator:
         # If iteration hasn't started yet, check if we have any selected tasks
         if not self._iteration_started:
             return bool(self._task_control.selected_tasks)
-        # Check if dispatcher has ready tasks or waiting tasks
-        dispatcher = self._dispatcher
-        return bool(dispatcher.ready or dispatcher.waiting)
+        # Check if dispatcher has ready, waiting or not yet expanded tasks
+        return self._dispatcher.has_pending()
 
     def get_ready_tasks(self):
         """Get all currently ready tasks for concurrent execution.
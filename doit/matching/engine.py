@@ -10,6 +10,11 @@ from .indexes import ExactIndex, PrefixIndex, CustomIndex
 from .protocols import MatchStrategy, Matchable
 
 
+# marks a dependency key missing from MatchingEngine._cache (None is a
+# valid cached result: no producer)
+_NOT_CACHED = object()
+
+
 class MatchingEngine:
     """Central coordinator for dependency-to-target matching.
 
@@ -51,15 +56,17 @@ class MatchingEngine:
         strategy = target.get_match_strategy()
         key = target.get_key()
 
+        # Invalidate cached results the new target may change. An exact
+        # target only matches (and takes precedence for) its own key.
         if strategy == MatchStrategy.EXACT:
             self._exact.register(key, task_name)
+            self._cache.pop(key, None)
         elif strategy == MatchStrategy.PREFIX:
             self._prefix.register(key, task_name)
+            self._cache.clear()
         elif strategy == MatchStrategy.CUSTOM:
             self._custom.register(target, task_name)
-
-        # Invalidate cache on registration
-        self._cache.clear()
+            self._cache.clear()
 
     def find_producer(self, dep: Matchable) -> Optional[str]:
         """Find the task that produces a target matching this dependency.
@@ -81,10 +88,9 @@ class MatchingEngine:
         key = dep.get_key()
 
         # Check cache first
-        if key in self._cache:
-            return self._cache[key]
-
-        result: Optional[str] = None
+        result = self._cache.get(key, _NOT_CACHED)
+        if result is not _NOT_CACHED:
+            return result
 
         # Try exact match first (fastest - O(1))
         result = self._exact.find(key)
@@ -6,7 +6,8 @@ Each index is optimized for a specific type of matching:
 - CustomIndex: O(n) linear scan for custom matching logic
 """
 
-from typing import Dict, List, Tuple, Optional, Any
+import sys
+from typing import Any, Callable, Dict, List, Tuple, Optional
 
 from .trie import PrefixTrie
 
@@ -15,6 +16,8 @@ class ExactIndex:
     """O(1) exact key lookup using dictionary.
 
     Used for FileDependency, S3Dependency, and other exact-match resources.
+    Keys and task names are interned, so repeated names share storage and
+    lookups compare by identity first.
     """
 
     def __init__(self):
@@ -30,6 +33,9 @@ class ExactIndex:
         Raises:
             ValueError: If key is already registered.
         """
+        # lookups with (interned) dependency keys compare by identity
+        key = sys.intern(key)
+        task_name = sys.intern(task_name)
         if key in self._by_key:
             raise ValueError(f"Duplicate key: {key}")
         self._by_key[key] = task_name
@@ -65,6 +71,7 @@ class PrefixIndex:
     """O(k) prefix lookup using trie (k = path depth).
 
     Used for DirectoryTarget, S3PrefixTarget, and other prefix-match resources.
+    Prefixes and task names are interned.
     """
 
     def __init__(self):
@@ -82,12 +89,13 @@ class PrefixIndex:
         Raises:
             ValueError: If prefix is already registered.
         """
-        # Normalize: ensure trailing /
-        normalized = prefix if prefix.endswith('/') else prefix + '/'
+        normalized = self._norm(prefix)
 
         if normalized in self._prefixes:
             raise ValueError(f"Duplicate prefix: {normalized}")
 
+        normalized = sys.intern(normalized)
+        task_name = sys.intern(task_name)
         self._prefixes[normalized] = task_name
         self._trie.insert(normalized, task_name)
 
@@ -102,6 +110,9 @@ class PrefixIndex:
         Returns:
             Task name of the longest matching prefix, or None.
         """
+        # most graphs have no prefix targets, skip splitting the key
+        if not self._prefixes:
+            return None
         return self._trie.find_longest_prefix(key)
 
     def find_all(self, key: str) -> List[str]:
@@ -113,6 +124,8 @@ class PrefixIndex:
         Returns:
             List of task names for all matching prefixes.
         """
+        if not self._prefixes:
+            return []
         return self._trie.find_all_prefixes(key)
 
     def contains(self, prefix: str) -> bool:
@@ -124,32 +137,50 @@ class PrefixIndex:
         Returns:
             True if this exact prefix is registered.
         """
-        normalized = prefix if prefix.endswith('/') else prefix + '/'
-        return normalized in self._prefixes
+        return self._norm(prefix) in self._prefixes
 
     def __len__(self) -> int:
         """Return number of registered prefixes."""
         return len(self._prefixes)
 
+    @staticmethod
+    def _norm(prefix: str) -> str:
+        """Return prefix with a trailing '/'.
+
+        Already normalized input is passed through without allocating.
+        """
+        if prefix[-1:] == '/':
+            return prefix
+        return prefix + '/'
+
+
+def _never_matches(dep: Any) -> bool:
+    """Stand-in for targets without a matches() method."""
+    return False
+
 
 class CustomIndex:
     """O(n) fallback for custom matching logic.
 
     Used for targets that need complex matching beyond exact/prefix.
     Linear scan through all registered targets, calling matches() on each.
+    The bound matches() method is looked up once at registration.
     """
 
     def __init__(self):
-        self._targets: List[Tuple[Any, str]] = []  # (target, task_name)
+        # (target.matches, task_name)
+        self._targets: List[Tuple[Callable[[Any], bool], str]] = []
 
     def register(self, target: Any, task_name: str) -> None:
         """Register a target with its producing task.
 
         Args:
-            target: The target object (must have matches() method).
+            target: The target object. Targets without a matches() method
+                never match.
             task_name: Name of the task that produces this target.
         """
-        self._targets.append((target, task_name))
+        matches = getattr(target, 'matches', None) or _never_matches
+        self._targets.append((matches, task_name))
 
     def find(self, dep: Any) -> Optional[str]:
         """Find task that produces a target matching this dependency.
@@ -163,8 +194,8 @@ class CustomIndex:
         Returns:
             Task name of first matching target, or None.
         """
-        for target, task_name in self._targets:
-            if hasattr(target, 'matches') and target.matches(dep):
+        for matches, task_name in self._targets:
+            if matches(dep):
                 return task_name
         return None
 
@@ -177,11 +208,8 @@ class CustomIndex:
         Returns:
             List of task names for all matching targets.
         """
-        results = []
-        for target, task_name in self._targets:
-            if hasattr(target, 'matches') and target.matches(dep):
-                results.append(task_name)
-        return results
+        return [task_name for matches, task_name in self._targets
+                if matches(dep)]
 
     def __len__(self) -> int:
         """Return number of registered targets."""
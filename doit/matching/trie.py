@@ -1,27 +1,43 @@
 """Prefix trie data structure for efficient prefix matching.
 
 This module provides a trie (prefix tree) optimized for path-like keys
-with a configurable separator (default '/').
+with a configurable separator (default '/'). Chains of single-child nodes
+are collapsed into one node (radix/Patricia trie) whose label is a raw
+substring, so a lookup is one ``str.startswith`` per branch point instead
+of one dict lookup per path component.
 """
 
-from dataclasses import dataclass, field
 from typing import Optional, List, TypeVar, Generic, Dict
 
 T = TypeVar('T')
 
 
-@dataclass
 class TrieNode(Generic[T]):
     """Node in a prefix trie.
 
+    Uses ``__slots__`` and creates ``children`` only when the first child
+    is added, so leaves carry neither an instance dict nor an empty dict.
+
     Attributes:
-        children: Child nodes keyed by path component.
+        children: Child nodes keyed by the first character of their label,
+            or None for a leaf.
         value: Associated value if this node is a terminal.
         is_terminal: Whether this node represents a complete prefix.
+        label: Substring of the normalized prefix covered by this node.
     """
-    children: Dict[str, 'TrieNode[T]'] = field(default_factory=dict)
-    value: Optional[T] = None
-    is_terminal: bool = False
+    __slots__ = ('children', 'value', 'is_terminal', 'label')
+
+    def __init__(self, children: Optional[Dict[str, 'TrieNode[T]']] = None,
+                 value: Optional[T] = None, is_terminal: bool = False,
+                 label: str = ''):
+        self.children = children
+        self.value = value
+        self.is_terminal = is_terminal
+        self.label = label
+
+    def __repr__(self):
+        return (f"TrieNode(label={self.label!r}, value={self.value!r}, "
+                f"is_terminal={self.is_terminal!r}, children={self.children!r})")
 
 
 class PrefixTrie(Generic[T]):
@@ -30,7 +46,12 @@ class PrefixTrie(Generic[T]):
     Supports:
     - Insert prefix with associated value
     - Find longest matching prefix for a key
-    - O(k) lookup where k is the path depth
+    - O(k) lookup where k is the key length, with one node visited
+      per branch point
+
+    Prefixes are matched on whole path components: empty components are
+    ignored and every stored prefix ends with the separator, so a match
+    always stops on a component boundary.
 
     Example:
         trie = PrefixTrie()
@@ -51,6 +72,8 @@ class PrefixTrie(Generic[T]):
         """
         self._root: TrieNode[T] = TrieNode()
         self._separator = separator
+        self._double = separator + separator
+        self._size = 0
 
     def insert(self, prefix: str, value: T) -> None:
         """Insert a prefix with associated value.
@@ -59,20 +82,45 @@ class PrefixTrie(Generic[T]):
             prefix: The prefix path to insert.
             value: Value to associate with this prefix.
         """
-        parts = self._split(prefix)
+        prefix = self._normalize_prefix(prefix)
+        size = len(prefix)
         node = self._root
-        for part in parts:
-            if part not in node.children:
-                node.children[part] = TrieNode()
-            node = node.children[part]
+        i = 0
+        while i < size:
+            if node.children is None:
+                node.children = {}
+            child = node.children.get(prefix[i])
+            if child is None:
+                node.children[prefix[i]] = TrieNode(
+                    value=value, is_terminal=True, label=prefix[i:])
+                self._size += 1
+                return
+            label = child.label
+            if prefix.startswith(label, i):
+                node = child
+                i += len(label)
+                continue
+            # Diverges (or ends) inside the label: split the node
+            limit = min(len(label), size - i)
+            common = 1
+            while common < limit and label[common] == prefix[i + common]:
+                common += 1
+            child.label = label[common:]
+            middle: TrieNode[T] = TrieNode(
+                children={child.label[0]: child}, label=label[:common])
+            node.children[prefix[i]] = middle
+            node = middle
+            i += common
+        if not node.is_terminal:
+            self._size += 1
         node.value = value
         node.is_terminal = True
 
     def find_longest_prefix(self, key: str) -> Optional[T]:
         """Find the longest registered prefix that matches key.
 
-        Traverses the trie following the key's path components,
-        tracking the most recent terminal node encountered.
+        Walks the trie advancing an offset into the key, tracking the
+        most recent terminal node encountered.
 
         Args:
             key: The key to find a matching prefix for.
@@ -86,7 +134,10 @@ class PrefixTrie(Generic[T]):
             "/data/output/processed/file.txt", returns the value
             for "/data/output/".
         """
-        parts = self._split(key)
+        sep = self._separator
+        if self._double in key:
+            key = self._collapse(key)
+        i = len(sep) if key.startswith(sep) else 0
         node = self._root
         result: Optional[T] = None
 
@@ -94,12 +145,27 @@ class PrefixTrie(Generic[T]):
         if node.is_terminal:
             result = node.value
 
-        for part in parts:
-            if part not in node.children:
+        size = len(key)
+        while i < size:
+            children = node.children
+            if children is None:
                 break
-            node = node.children[part]
+            node = children.get(key[i])
+            if node is None:
+                break
+            label = node.label
+            if not key.startswith(label, i):
+                if node.is_terminal and key[i:] + sep == label:
+                    result = node.value
+                break
+            i += len(label)
             if node.is_terminal:
                 result = node.value
+        else:
+            # key ended at a node split right before a trailing separator
+            tail = self._separator_child(node)
+            if tail is not None:
+                result = tail.value
 
         return result
 
@@ -116,22 +182,52 @@ class PrefixTrie(Generic[T]):
             List of values for all matching prefixes, ordered
             from shortest to longest prefix.
         """
-        parts = self._split(key)
+        sep = self._separator
+        if self._double in key:
+            key = self._collapse(key)
+        i = len(sep) if key.startswith(sep) else 0
         node = self._root
         results: List[T] = []
 
         if node.is_terminal and node.value is not None:
             results.append(node.value)
 
-        for part in parts:
-            if part not in node.children:
+        size = len(key)
+        while i < size:
+            children = node.children
+            if children is None:
+                break
+            node = children.get(key[i])
+            if node is None:
                 break
-            node = node.children[part]
+            label = node.label
+            if not key.startswith(label, i):
+                if (node.is_terminal and node.value is not None
+                        and key[i:] + sep == label):
+                    results.append(node.value)
+                break
+            i += len(label)
             if node.is_terminal and node.value is not None:
                 results.append(node.value)
+        else:
+            # key ended at a node split right before a trailing separator
+            tail = self._separator_child(node)
+            if tail is not None and tail.value is not None:
+                results.append(tail.value)
 
         return results
 
+    def _separator_child(self, node: TrieNode[T]) -> Optional[TrieNode[T]]:
+        """Return node's terminal child labeled with just the separator."""
+        children = node.children
+        if children is None:
+            return None
+        sep = self._separator
+        child = children.get(sep[0])
+        if child is not None and child.is_terminal and child.label == sep:
+            return child
+        return None
+
     def contains(self, prefix: str) -> bool:
         """Check if an exact prefix is registered.
 
@@ -141,21 +237,101 @@ class PrefixTrie(Generic[T]):
         Returns:
             True if this exact prefix is registered.
         """
-        parts = self._split(prefix)
-        node = self._root
-        for part in parts:
-            if part not in node.children:
-                return False
-            node = node.children[part]
-        return node.is_terminal
+        node = self._find_node(prefix)
+        return node is not None and node.is_terminal
+
+    def get(self, prefix: str, default: Optional[T] = None) -> Optional[T]:
+        """Return the value stored for an exact prefix.
+
+        Args:
+            prefix: The prefix to look up.
+            default: Returned when the prefix is not registered.
+        """
+        node = self._find_node(prefix)
+        if node is None or not node.is_terminal:
+            return default
+        return node.value
+
+    def find_all_extensions(self, key: str) -> List[T]:
+        """Find all registered prefixes at or under key.
 
-    def _split(self, path: str) -> List[str]:
-        """Split path into components, filtering empty strings.
+        This is the reverse of find_all_prefixes: it returns values for
+        prefixes that start with key (on component boundaries), e.g. for
+        a directory key. Order follows the trie layout.
 
         Args:
-            path: Path string to split.
+            key: The key whose sub-prefixes to collect.
 
         Returns:
-            List of non-empty path components.
+            List of values for all prefixes under key.
+        """
+        key = self._normalize_prefix(key)
+        size = len(key)
+        node = self._root
+        i = 0
+        while i < size:
+            children = node.children
+            if children is None:
+                return []
+            node = children.get(key[i])
+            if node is None:
+                return []
+            label = node.label
+            if key.startswith(label, i):
+                i += len(label)
+            elif label.startswith(key[i:]):
+                # key ends inside this node's label
+                break
+            else:
+                return []
+
+        results: List[T] = []
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node.is_terminal and node.value is not None:
+                results.append(node.value)
+            if node.children:
+                stack.extend(node.children.values())
+        return results
+
+    def __len__(self) -> int:
+        """Return number of registered prefixes."""
+        return self._size
+
+    def _find_node(self, prefix: str) -> Optional[TrieNode[T]]:
+        """Return the node ending exactly at prefix, or None."""
+        prefix = self._normalize_prefix(prefix)
+        size = len(prefix)
+        node = self._root
+        i = 0
+        while i < size:
+            children = node.children
+            if children is None:
+                return None
+            node = children.get(prefix[i])
+            if node is None or not prefix.startswith(node.label, i):
+                return None
+            i += len(node.label)
+        return node
+
+    def _collapse(self, key: str) -> str:
+        """Collapse runs of separators so empty components are skipped."""
+        sep = self._separator
+        double = self._double
+        while double in key:
+            key = key.replace(double, sep)
+        return key
+
+    def _normalize_prefix(self, prefix: str) -> str:
+        """Return prefix in the stored form: components joined by the
+        separator, with a trailing separator and no leading one.
         """
-        return [p for p in path.split(self._separator) if p]
+        sep = self._separator
+        if self._double in prefix:
+            prefix = self._collapse(prefix)
+        if prefix.startswith(sep):
+            prefix = prefix[len(sep):]
+        if prefix and not prefix.endswith(sep):
+            prefix += sep
+        return prefix
@@ -3,12 +3,13 @@
 This is the main entry point for reactive task generation. It coordinates:
 1. Initial generation from all TaskGenerators
 2. Streaming execution of tasks
-3. Immediate regeneration after each task completes
+3. Regeneration from the outputs of completed tasks, in small batches
 4. Injection of new tasks into the running execution
 
 The streaming model (tup-like) ensures that:
 - Tasks become ready from TWO sources: generation AND dependency completion
-- After each task completes, affected generators are immediately regenerated
+- Affected generators are regenerated as tasks complete (batched, and
+  always before the ready queue runs dry)
 - New tasks go into the same ready queue
 - Early-stage work is processed before unrelated later-stage tasks
 """
@@ -85,17 +86,34 @@ class ReactiveEngine:
     store: Optional['ProcessingStateStore'] = None
     """State store for task dependency tracking."""
 
+    regen_batch_size: int = 16
+    """Outputs to collect from completed tasks before regenerating.
+
+    Regeneration also runs whenever the engine has no other tasks pending,
+    so new tasks are never lost. Use 1 to regenerate after every task."""
+
+    generate_workers: int = 1
+    """Threads used to run generators concurrently (see GeneratorManager).
+
+    Values above 1 require thread-safe generators."""
+
     _manager: GeneratorManager = field(init=False, repr=False)
     _merger: TaskMerger = field(init=False, repr=False)
     _tasks_executed: int = field(default=0, init=False, repr=False)
     _regenerations: int = field(default=0, init=False, repr=False)
+    _pending_outputs: List[str] = field(
+        default_factory=list, init=False, repr=False)
 
     def __post_init__(self):
         """Initialize internal components."""
-        self._manager = GeneratorManager(generators=list(self.generators))
+        self._manager = GeneratorManager(
+            generators=list(self.generators),
+            generate_workers=self.generate_workers,
+        )
         self._merger = TaskMerger()
         self._tasks_executed = 0
         self._regenerations = 0
+        self._pending_outputs = []
 
     def run(self) -> ReactiveResult:
         """Execute until no more tasks can be generated or run.
@@ -103,7 +121,8 @@ class ReactiveEngine:
         This is the main entry point. It:
         1. Generates initial tasks from all generators
         2. Creates a streaming iterator for execution
-        3. For each completed task, regenerates affected generators
+        3. Collects outputs of completed tasks and regenerates affected
+           generators once per batch (see regen_batch_size)
         4. Injects new tasks into the running execution
         5. Continues until fixed-point or limit reached
 
@@ -114,8 +133,7 @@ class ReactiveEngine:
         from doit.engine import DoitEngine
 
         # Initial generation
-        initial_tasks = self._manager.regenerate_all()
-        self._merger.merge(initial_tasks)
+        self._merger.merge(self._manager.iter_regenerate_all())
         self._regenerations += 1
 
         if not self._merger.total_tasks:
@@ -143,14 +161,17 @@ class ReactiveEngine:
                     wrapper.execute_and_submit()
                     self._merger.mark_completed(wrapper.name)
                     self._tasks_executed += 1
-
-                    # STREAMING: Immediately regenerate affected generators
-                    new_tasks = self._regenerate_for_task(wrapper.task)
-
+                    self._pending_outputs.extend(
+                        self._iter_task_outputs(wrapper.task))
+
+                # STREAMING: regenerate affected generators once enough
+                # outputs are collected, or before the engine runs dry
+                pending = self._pending_outputs
+                if pending and (len(pending) >= self.regen_batch_size or
+                                not engine.has_pending_tasks):
                     # Inject new/updated tasks into the running engine
-                    if new_tasks:
-                        for task in new_tasks:
-                            engine.add_task(task)
+                    for task in self._flush_regen():
+                        engine.add_task(task)
 
         return ReactiveResult(
             tasks_executed=self._tasks_executed,
@@ -159,57 +180,53 @@ class ReactiveEngine:
             regenerations=self._regenerations,
         )
 
-    def _regenerate_for_task(self, task: 'Task') -> List['Task']:
-        """Regenerate generators based on task outputs.
-
-        Called immediately after each task completes.
-
-        Args:
-            task: The task that just completed
+    def _flush_regen(self) -> List['Task']:
+        """Regenerate generators based on the collected task outputs.
 
         Returns:
             List of new/updated tasks to inject
         """
-        # Get outputs from the task
-        outputs = self._get_task_outputs(task)
+        # dedupe, keeping order; the dict is consumed as an iterable
+        outputs = dict.fromkeys(self._pending_outputs)
+        self._pending_outputs = []
 
         if not outputs:
             return []
 
-        # Regenerate affected generators
-        new_tasks = self._manager.regenerate_affected(outputs)
+        # Regenerate affected generators, merging tasks as they come
+        result = self._merger.merge(
+            self._manager.iter_regenerate_affected(outputs))
         self._regenerations += 1
 
-        if not new_tasks:
-            return []
-
-        # Merge with existing tasks
-        result = self._merger.merge(new_tasks)
-
         # Return tasks that need to be injected
         return result.all_new_tasks
 
-    def _get_task_outputs(self, task: 'Task') -> List[str]:
-        """Get output paths from a task.
+    def _iter_task_outputs(self, task: 'Task') -> Iterator[str]:
+        """Yield output paths from a task.
 
-        Extracts paths from both the new Target objects and
-        legacy string targets.
+        Yields keys of the new Target objects, then legacy string
+        targets, without building an intermediate list.
         """
-        outputs = []
-
         # New-style Target objects
-        if hasattr(task, 'outputs'):
-            for out in task.outputs:
-                if hasattr(out, 'get_key'):
-                    outputs.append(out.get_key())
+        for out in getattr(task, 'outputs', None) or ():
+            try:
+                get_key = out.get_key
+            except AttributeError:
+                continue
+            yield get_key()
 
         # Legacy string targets
-        if hasattr(task, 'targets'):
-            for target in task.targets:
-                if isinstance(target, str):
-                    outputs.append(target)
+        for target in getattr(task, 'targets', None) or ():
+            if isinstance(target, str):
+                yield target
 
-        return outputs
+    def _get_task_outputs(self, task: 'Task') -> List[str]:
+        """Get output paths from a task.
+
+        Extracts paths from both the new Target objects and
+        legacy string targets.
+        """
+        return list(self._iter_task_outputs(task))
 
     def add_generator(self, generator: 'TaskGenerator') -> None:
         """Add a generator after initialization.
@@ -227,6 +244,7 @@ class ReactiveEngine:
         self._merger.clear()
         self._tasks_executed = 0
         self._regenerations = 0
+        self._pending_outputs = []
 
     @property
     def tasks_executed(self) -> int:
@@ -6,13 +6,40 @@ an efficient prefix-based index for that lookup.
 """
 
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, TYPE_CHECKING
+from typing import Dict, Iterable, List, Tuple, TYPE_CHECKING
+
+from doit.matching.trie import PrefixTrie
 
 if TYPE_CHECKING:
     from doit.taskgen import TaskGenerator
 
 
+@lru_cache(maxsize=None)
+def _static_prefix(pattern: str) -> str:
+    """Cached body of OutputPatternIndex._extract_static_prefix."""
+    # Find the first < character
+    bracket_pos = pattern.find('<')
+    if bracket_pos == -1:
+        # No placeholders - the whole pattern is static
+        # Return the directory portion
+        last_slash = pattern.rfind('/')
+        if last_slash == -1:
+            return ""
+        return pattern[:last_slash + 1]
+
+    # Get everything before the first placeholder
+    prefix = pattern[:bracket_pos]
+
+    # Trim to the last directory separator
+    last_slash = prefix.rfind('/')
+    if last_slash == -1:
+        return ""
+
+    return prefix[:last_slash + 1]
+
+
 @dataclass
 class OutputPatternIndex:
     """Index for fast output-to-generator pattern matching.
@@ -20,6 +47,10 @@ class OutputPatternIndex:
     Maps output path prefixes to generators whose input patterns
     could potentially match files under those prefixes.
 
+    Prefixes are kept in a PrefixTrie, so a lookup costs one trie walk
+    per output instead of a scan over every registered prefix. Matching
+    is done on whole path components.
+
     Example:
         If a generator has input pattern "processed/<doc>.json",
         we extract the static prefix "processed/" and register it.
@@ -27,10 +58,13 @@ class OutputPatternIndex:
         we can quickly find this generator as potentially affected.
     """
 
-    _prefix_to_generators: Dict[str, List['TaskGenerator']] = field(
-        default_factory=dict
+    _trie: PrefixTrie[List['TaskGenerator']] = field(
+        default_factory=PrefixTrie
     )
     _generators: List['TaskGenerator'] = field(default_factory=list)
+    # (base_path, relative_prefix) -> resolved prefix, absolute base paths
+    # only (a relative one depends on the current directory)
+    _resolved: Dict[Tuple[Path, str], str] = field(default_factory=dict)
 
     def register_generator(self, generator: 'TaskGenerator') -> None:
         """Register a generator's input patterns for lookup.
@@ -43,10 +77,12 @@ class OutputPatternIndex:
 
         for label, inp in generator.inputs.items():
             prefix = self._compute_absolute_prefix(inp)
-            if prefix not in self._prefix_to_generators:
-                self._prefix_to_generators[prefix] = []
-            if generator not in self._prefix_to_generators[prefix]:
-                self._prefix_to_generators[prefix].append(generator)
+            generators = self._trie.get(prefix)
+            if generators is None:
+                generators = []
+                self._trie.insert(prefix, generators)
+            if generator not in generators:
+                generators.append(generator)
 
     def register_generators(self, generators: List['TaskGenerator']) -> None:
         """Register multiple generators."""
@@ -54,7 +90,7 @@ class OutputPatternIndex:
             self.register_generator(gen)
 
     def find_affected_generators(
-        self, outputs: List[str]
+        self, outputs: Iterable[str]
     ) -> List['TaskGenerator']:
         """Find generators whose input patterns could match these outputs.
 
@@ -62,31 +98,33 @@ class OutputPatternIndex:
         their input patterns might now match new files.
 
         Args:
-            outputs: List of output paths/keys that were created
+            outputs: Output paths/keys that were created. Consumed in a
+                single pass, so any iterable works.
 
         Returns:
             List of TaskGenerators that might produce new tasks (no duplicates)
         """
-        affected: List['TaskGenerator'] = []
-        seen_ids: set = set()
+        # id -> generator: dedupes and keeps first-seen order
+        collected: Dict[int, 'TaskGenerator'] = {}
+        # once every generator is affected, the rest of the batch can't
+        # add anything
+        total = len(self._generators)
 
+        trie = self._trie
         for output_path in outputs:
-            # Normalize the output path
-            normalized = self._normalize_path(output_path)
-
-            # Check each registered prefix
-            for prefix, generators in self._prefix_to_generators.items():
-                normalized_prefix = prefix.rstrip('/')
-                # If output starts with prefix, or prefix starts with output
-                # (for directory outputs that contain the prefix)
-                if (normalized.startswith(normalized_prefix) or
-                        normalized_prefix.startswith(normalized)):
-                    for gen in generators:
-                        if id(gen) not in seen_ids:
-                            seen_ids.add(id(gen))
-                            affected.append(gen)
-
-        return affected
+            # No normalization needed: the trie already ignores trailing
+            # and repeated separators, for local paths and S3 URIs alike.
+            # Prefixes the output falls under, plus prefixes under the
+            # output (for directory outputs that contain the prefix)
+            matches = trie.find_all_prefixes(output_path)
+            matches.extend(trie.find_all_extensions(output_path))
+            for generators in matches:
+                for gen in generators:
+                    collected[id(gen)] = gen
+            if len(collected) == total:
+                break
+
+        return list(collected.values())
 
     def get_all_generators(self) -> List['TaskGenerator']:
         """Return all registered generators."""
@@ -109,15 +147,26 @@ class OutputPatternIndex:
         # If input has a base_path, make the prefix absolute
         base_path = getattr(inp, 'base_path', None)
         if base_path is not None and isinstance(base_path, Path):
-            if relative_prefix:
-                abs_path = base_path / relative_prefix
-            else:
-                abs_path = base_path
-            return str(abs_path.resolve()) + '/'
+            return self._resolve_prefix(base_path, relative_prefix)
 
         # For S3 or other inputs without base_path, use the relative prefix
         return relative_prefix
 
+    def _resolve_prefix(self, base_path: Path, relative_prefix: str) -> str:
+        """Resolve relative_prefix under base_path, with a trailing '/'.
+
+        Generators commonly share base paths and input prefixes, so each
+        distinct pair with an absolute base_path hits the filesystem once.
+        """
+        key = (base_path, relative_prefix)
+        resolved = self._resolved.get(key)
+        if resolved is None:
+            abs_path = base_path / relative_prefix if relative_prefix else base_path
+            resolved = str(abs_path.resolve()) + '/'
+            if base_path.is_absolute():
+                self._resolved[key] = resolved
+        return resolved
+
     def _extract_static_prefix(self, pattern: str) -> str:
         """Extract the static prefix before any <capture> placeholders.
 
@@ -127,52 +176,18 @@ class OutputPatternIndex:
             "<name>.txt" -> ""
             "data/fixed/file.txt" -> "data/fixed/"
         """
-        # Find the first < character
-        bracket_pos = pattern.find('<')
-        if bracket_pos == -1:
-            # No placeholders - the whole pattern is static
-            # Return the directory portion
-            last_slash = pattern.rfind('/')
-            if last_slash == -1:
-                return ""
-            return pattern[:last_slash + 1]
-
-        # Get everything before the first placeholder
-        prefix = pattern[:bracket_pos]
-
-        # Trim to the last directory separator
-        last_slash = prefix.rfind('/')
-        if last_slash == -1:
-            return ""
-
-        return prefix[:last_slash + 1]
-
-    def _normalize_path(self, path: str) -> str:
-        """Normalize a path for comparison.
-
-        Removes trailing slashes and handles S3 URIs.
-        """
-        # Handle S3 URIs
-        if path.startswith('s3://'):
-            # Keep the s3:// prefix but normalize the rest
-            path = path[5:]  # Remove s3://
-            parts = path.split('/', 1)
-            if len(parts) == 2:
-                bucket, key = parts
-                return f"s3://{bucket}/{key.rstrip('/')}"
-            return f"s3://{path.rstrip('/')}"
-
-        return path.rstrip('/')
+        return _static_prefix(pattern)
 
     def clear(self) -> None:
         """Clear all registered generators."""
-        self._prefix_to_generators.clear()
+        self._trie = PrefixTrie()
         self._generators.clear()
+        self._resolved.clear()
 
     @property
     def prefix_count(self) -> int:
         """Return the number of registered prefixes."""
-        return len(self._prefix_to_generators)
+        return len(self._trie)
 
     @property
     def generator_count(self) -> int:
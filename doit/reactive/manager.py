@@ -5,8 +5,9 @@ newly created outputs. It uses the OutputPatternIndex to efficiently
 determine which generators might produce new tasks.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import List, TYPE_CHECKING
+from typing import Iterable, Iterator, List, Sequence, TYPE_CHECKING
 
 from .index import OutputPatternIndex
 
@@ -29,25 +30,25 @@ class GeneratorManager:
     output_index: OutputPatternIndex = field(default_factory=OutputPatternIndex)
     """Index for finding affected generators by output path."""
 
-    _initialized: bool = field(default=False, repr=False)
-    """Whether the index has been built."""
+    generate_workers: int = 1
+    """Threads used to run generate() of several generators at once.
+
+    Generators usually glob the filesystem or list S3 objects, which is
+    I/O bound. With more than 1 worker, generators must be thread-safe.
+    Tasks are still returned in generator order."""
 
     def __post_init__(self):
-        """Build the output index from generators."""
-        if self.generators and not self._initialized:
-            self._build_index()
+        """Build the output index from generators.
 
-    def _build_index(self) -> None:
-        """Build the output pattern index from all generators."""
-        self.output_index.clear()
+        From here on the index is kept up to date by add_generator()
+        and clear(), so it is never rebuilt.
+        """
         self.output_index.register_generators(self.generators)
-        self._initialized = True
 
     def add_generator(self, generator: 'TaskGenerator') -> None:
         """Add a generator and update the index."""
         self.generators.append(generator)
         self.output_index.register_generator(generator)
-        self._initialized = True
 
     def add_generators(self, generators: List['TaskGenerator']) -> None:
         """Add multiple generators."""
@@ -62,15 +63,17 @@ class GeneratorManager:
         Returns:
             List of all Task objects from all generators
         """
-        if not self._initialized:
-            self._build_index()
+        return list(self.iter_regenerate_all())
 
-        tasks: List['Task'] = []
-        for gen in self.generators:
-            tasks.extend(gen.generate())
-        return tasks
+    def iter_regenerate_all(self) -> Iterator['Task']:
+        """Streaming variant of regenerate_all().
+
+        Yields tasks as generators produce them, without building the
+        whole list first.
+        """
+        return self._iter_generate(self.generators)
 
-    def regenerate_affected(self, new_outputs: List[str]) -> List['Task']:
+    def regenerate_affected(self, new_outputs: Iterable[str]) -> List['Task']:
         """Regenerate only generators whose inputs might match new outputs.
 
         This is the efficient path used after each task completes.
@@ -78,23 +81,43 @@ class GeneratorManager:
         outputs are regenerated.
 
         Args:
-            new_outputs: List of output paths/keys created by a task
+            new_outputs: Output paths/keys created by completed tasks.
+                Any re-iterable collection; it is iterated once.
 
         Returns:
             List of Task objects from affected generators
         """
-        if not self._initialized:
-            self._build_index()
+        return list(self.iter_regenerate_affected(new_outputs))
 
+    def iter_regenerate_affected(
+        self, new_outputs: Iterable[str]
+    ) -> Iterator['Task']:
+        """Streaming variant of regenerate_affected().
+
+        Affected generators are looked up right away; their tasks are
+        yielded as they are produced.
+        """
         if not new_outputs:
-            return []
+            return iter(())
 
         affected = self.output_index.find_affected_generators(new_outputs)
-
-        tasks: List['Task'] = []
-        for gen in affected:
-            tasks.extend(gen.generate())
-        return tasks
+        return self._iter_generate(affected)
+
+    def _iter_generate(
+        self, generators: Sequence['TaskGenerator']
+    ) -> Iterator['Task']:
+        """Run generate() of each generator and yield the tasks, in order."""
+        if self.generate_workers > 1 and len(generators) > 1:
+            with ThreadPoolExecutor(
+                    max_workers=self.generate_workers) as executor:
+                # generate() may be lazy: consume it on the worker thread
+                results = executor.map(
+                    lambda gen: list(gen.generate()), generators)
+                for generated in results:
+                    yield from generated
+        else:
+            for gen in generators:
+                yield from gen.generate()
 
     def find_affected_generators(
         self, new_outputs: List[str]
@@ -103,16 +126,12 @@ class GeneratorManager:
 
         Useful for debugging or introspection.
         """
-        if not self._initialized:
-            self._build_index()
-
         return self.output_index.find_affected_generators(new_outputs)
 
     def clear(self) -> None:
         """Clear all generators and the index."""
         self.generators.clear()
         self.output_index.clear()
-        self._initialized = False
 
     @property
     def generator_count(self) -> int:
@@ -8,8 +8,9 @@ When generators produce new tasks, we need to:
 This module handles that diffing logic.
 """
 
+import sys
 from dataclasses import dataclass, field
-from typing import Dict, List, Set, TYPE_CHECKING
+from typing import Dict, FrozenSet, Iterable, List, Set, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from doit.task import Task
@@ -39,115 +40,172 @@ class MergeResult:
         return self.added + self.updated
 
 
+class TaskEntry:
+    """Per-task state kept by TaskMerger."""
+
+    __slots__ = ('task', 'inputs', 'done')
+
+    def __init__(self, task: 'Task', inputs: FrozenSet[str],
+                 done: bool = False):
+        self.task = task
+        """Latest Task object generated under this name."""
+        self.inputs = inputs
+        """Set of the task's input dependency keys."""
+        self.done = done
+        """Whether the task has completed execution."""
+
+    def __repr__(self):
+        return "<TaskEntry %s done=%s>" % (self.task.name, self.done)
+
+
 @dataclass
 class TaskMerger:
     """Merge newly generated tasks with existing task set.
 
     Tracks which tasks exist, which have been completed, and detects
     when task inputs change (requiring re-execution).
-    """
 
-    existing_tasks: Dict[str, 'Task'] = field(default_factory=dict)
-    """Map of task name to Task object."""
+    All state for a task lives in a single TaskEntry, so each task
+    costs one dict lookup per merge.
+    """
 
-    completed_tasks: Set[str] = field(default_factory=set)
-    """Set of task names that have completed execution."""
+    entries: Dict[str, TaskEntry] = field(default_factory=dict)
+    """Map of task name to its TaskEntry."""
 
-    _input_hashes: Dict[str, frozenset] = field(default_factory=dict)
-    """Cache of input dependency keys for change detection."""
+    _completed_count: int = field(default=0, repr=False)
+    _pending_count: int = field(default=0, repr=False)
 
-    def merge(self, new_tasks: List['Task']) -> MergeResult:
+    def merge(self, new_tasks: Iterable['Task']) -> MergeResult:
         """Merge new tasks, detecting additions and changes.
 
         Args:
-            new_tasks: List of newly generated Task objects
+            new_tasks: Newly generated Task objects. Consumed in a single
+                pass, so a streaming iterator works.
 
         Returns:
             MergeResult with categorized tasks
         """
         result = MergeResult()
+        entries = self.entries
 
         for task in new_tasks:
-            if task.name not in self.existing_tasks:
-                # Completely new task
-                self.existing_tasks[task.name] = task
-                self._input_hashes[task.name] = self._get_input_hash(task)
+            name = task.name
+            entry = entries.get(name)
+            if entry is None:
+                # Completely new task; the interned name is shared with
+                # the other indexes keyed by task name
+                entries[sys.intern(name)] = TaskEntry(
+                    task, self._get_input_hash(task))
+                self._pending_count += 1
                 result.added.append(task)
+            elif entry.task is task:
+                # Generator returned the very same Task object: unchanged
+                result.unchanged.append(name)
             else:
                 # Task already exists - check if inputs changed
-                old_hash = self._input_hashes.get(task.name, frozenset())
-                new_hash = self._get_input_hash(task)
+                new_inputs = self._get_input_hash(task)
 
-                if old_hash != new_hash:
+                if entry.inputs != new_inputs:
                     # Inputs changed - update and mark for re-run
-                    self.existing_tasks[task.name] = task
-                    self._input_hashes[task.name] = new_hash
+                    entry.task = task
+                    entry.inputs = new_inputs
 
-                    if task.name in self.completed_tasks:
-                        # Task already ran - needs to re-run
-                        self._invalidate(task.name)
+                    if entry.done:
+                        # Task already ran - needs to re-run (same as
+                        # _invalidate(), without looking the entry up again)
+                        entry.done = False
+                        self._completed_count -= 1
+                        self._pending_count += 1
 
                     result.updated.append(task)
                 else:
                     # No change
-                    result.unchanged.append(task.name)
+                    result.unchanged.append(name)
 
         return result
 
     def mark_completed(self, task_name: str) -> None:
-        """Mark a task as completed."""
-        self.completed_tasks.add(task_name)
+        """Mark a task as completed.
+
+        Names that were never merged are ignored.
+        """
+        entry = self.entries.get(task_name)
+        if entry is not None and not entry.done:
+            entry.done = True
+            self._completed_count += 1
+            self._pending_count -= 1
 
     def is_completed(self, task_name: str) -> bool:
         """Check if a task has completed."""
-        return task_name in self.completed_tasks
+        entry = self.entries.get(task_name)
+        return entry is not None and entry.done
 
     def get_task(self, task_name: str) -> 'Task':
         """Get a task by name."""
-        return self.existing_tasks.get(task_name)
+        entry = self.entries.get(task_name)
+        return entry.task if entry is not None else None
 
     def get_all_tasks(self) -> List['Task']:
         """Get all tasks."""
-        return list(self.existing_tasks.values())
+        return [entry.task for entry in self.entries.values()]
 
-    def _get_input_hash(self, task: 'Task') -> frozenset:
+    def _get_input_hash(self, task: 'Task') -> FrozenSet[str]:
         """Get a hashable representation of task inputs.
 
-        Used to detect when a task's dependencies have changed.
+        Used to detect when a task's dependencies have changed. The set of
+        dependency keys is kept and compared exactly (order and duplicates
+        don't matter).
         """
-        dep_keys = set()
-        for dep in task.dependencies:
-            if hasattr(dep, 'get_key'):
-                dep_keys.add(dep.get_key())
-            else:
-                # Legacy string dependency
-                dep_keys.add(str(dep))
-        return frozenset(dep_keys)
+        dependencies = task.dependencies
+        try:
+            dep_keys = frozenset([dep.get_key() for dep in dependencies])
+        except AttributeError:
+            # Legacy string dependency
+            keys = []
+            for dep in dependencies:
+                get_key = getattr(dep, 'get_key', None)
+                keys.append(get_key() if get_key is not None else str(dep))
+            dep_keys = frozenset(keys)
+        return dep_keys
 
     def _invalidate(self, task_name: str) -> None:
         """Mark a completed task for re-execution.
 
-        Removes it from the completed set so it will be re-evaluated.
+        Clears its completed flag so it will be re-evaluated.
         """
-        self.completed_tasks.discard(task_name)
+        entry = self.entries.get(task_name)
+        if entry is not None and entry.done:
+            entry.done = False
+            self._completed_count -= 1
+            self._pending_count += 1
 
     def clear(self) -> None:
         """Clear all state."""
-        self.existing_tasks.clear()
-        self.completed_tasks.clear()
-        self._input_hashes.clear()
+        self.entries.clear()
+        self._completed_count = 0
+        self._pending_count = 0
+
+    @property
+    def existing_tasks(self) -> Dict[str, 'Task']:
+        """Return a map of task name to Task object."""
+        return {name: entry.task for name, entry in self.entries.items()}
+
+    @property
+    def completed_tasks(self) -> Set[str]:
+        """Return the names of tasks that have completed execution."""
+        return {name for name, entry in self.entries.items() if entry.done}
 
     @property
     def total_tasks(self) -> int:
         """Return total number of tasks."""
-        return len(self.existing_tasks)
+        return len(self.entries)
 
     @property
     def completed_count(self) -> int:
         """Return number of completed tasks."""
-        return len(self.completed_tasks)
+        return self._completed_count
 
     @property
     def pending_count(self) -> int:
         """Return number of pending (not completed) tasks."""
-        return self.total_tasks - self.completed_count
+        return self._pending_count
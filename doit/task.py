@@ -2,10 +2,12 @@
 """Tasks are the main abstractions managed by doit"""
 
 import os
+import re
 import sys
 import inspect
 from collections import OrderedDict
 from collections.abc import Callable
+from functools import lru_cache
 from pathlib import Path, PurePath
 
 import warnings
@@ -17,14 +19,19 @@ from .dependency import UptodateCalculator, StorageKey
 from .deps import Dependency, FileDependency, TaskDependency, Target
 
 
+# line boundaries recognized by str.splitlines()
+_LINE_END = re.compile('[\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]')
+
+
 def first_line(doc):
     """extract first non-blank line from text, to extract docstring title"""
-    if doc is not None:
-        for line in doc.splitlines():
-            striped = line.strip()
-            if striped:
-                return striped
-    return ''
+    if doc is None:
+        return ''
+    # blank lines are whitespace only, so the first non-blank line starts
+    # right after the leading whitespace: no need to split every line
+    text = doc.lstrip()
+    end = _LINE_END.search(text)
+    return (text[:end.start()] if end else text).rstrip()
 
 
 class DelayedLoader(object):
@@ -107,6 +114,34 @@ class IOConfig:
         return f'IOConfig(capture={self.capture})'
 
 
+def _uptodate_value(item):
+    """uptodate item: bool or None"""
+    return (item, None, None)
+
+
+def _uptodate_tuple(item):
+    """uptodate item: (callable, args, kwargs)"""
+    call = item[0]
+    args = list(item[1]) if len(item) > 1 else []
+    kwargs = item[2] if len(item) > 2 else {}
+    return (call, args, kwargs)
+
+
+def _uptodate_call(item):
+    """uptodate item: callable or str (a command)"""
+    return (item, [], {})
+
+
+# exact type of a (non-callable) uptodate item -> normalizer.
+# other types go through Task._init_uptodate checks.
+_UPTODATE_DISPATCH = {
+    bool: _uptodate_value,
+    type(None): _uptodate_value,
+    tuple: _uptodate_tuple,
+    str: _uptodate_call,
+}
+
+
 class Task(object):
     """Task
 
@@ -145,6 +180,18 @@ class Task(object):
                         parameter and returns a string.
     """
 
+    __slots__ = ('name', 'params', 'creator_params', 'options', 'pos_arg',
+                 'pos_arg_val', 'setup_tasks', 'io', '_action_instances',
+                 '_actions', '_dependencies', 'wild_dep', 'calc_dep',
+                 'dep_changed', 'loader', 'getargs', 'value_savers',
+                 'uptodate', 'targets', '_outputs', 'subtask_of',
+                 'has_subtask', 'result', 'values', 'verbosity',
+                 'custom_title', 'cfg_values', '_remove_targets',
+                 'clean_actions', 'teardown', 'doc', 'watch', 'meta',
+                 'executed',
+                 # attributes set by plugins/user code are still allowed
+                 '__dict__', '__weakref__')
+
     DEFAULT_VERBOSITY = 1
     string_types = (str, )
     # list of valid types/values for each task attribute.
@@ -186,26 +233,19 @@ class Task(object):
         """
 
         getargs = getargs or {}  # default
-        self.check_attr(name, 'name', name, self.valid_attr['name'])
-        self.check_attr(name, 'actions', actions, self.valid_attr['actions'])
-        self.check_attr(name, 'dependencies', dependencies,
-                        self.valid_attr['dependencies'])
-        self.check_attr(name, 'uptodate', uptodate, self.valid_attr['uptodate'])
-        self.check_attr(name, 'calc_dep', calc_dep, self.valid_attr['calc_dep'])
-        self.check_attr(name, 'targets', targets, self.valid_attr['targets'])
-        self.check_attr(name, 'outputs', outputs, self.valid_attr['outputs'])
-        self.check_attr(name, 'setup', setup, self.valid_attr['setup'])
-        self.check_attr(name, 'clean', clean, self.valid_attr['clean'])
-        self.check_attr(name, 'teardown', teardown, self.valid_attr['teardown'])
-        self.check_attr(name, 'doc', doc, self.valid_attr['doc'])
-        self.check_attr(name, 'params', params, self.valid_attr['params'])
-        self.check_attr(name, 'pos_arg', pos_arg, self.valid_attr['pos_arg'])
-        self.check_attr(name, 'verbosity', verbosity, self.valid_attr['verbosity'])
-        self.check_attr(name, 'io', io, self.valid_attr['io'])
-        self.check_attr(name, 'getargs', getargs, self.valid_attr['getargs'])
-        self.check_attr(name, 'title', title, self.valid_attr['title'])
-        self.check_attr(name, 'watch', watch, self.valid_attr['watch'])
-        self.check_attr(name, 'meta', meta, self.valid_attr['meta'])
+        valid_attr = self.valid_attr
+        checked = (('name', name), ('actions', actions),
+                   ('dependencies', dependencies), ('uptodate', uptodate),
+                   ('calc_dep', calc_dep), ('targets', targets),
+                   ('outputs', outputs), ('setup', setup), ('clean', clean),
+                   ('teardown', teardown), ('doc', doc), ('params', params),
+                   ('pos_arg', pos_arg), ('verbosity', verbosity),
+                   ('io', io), ('getargs', getargs), ('title', title),
+                   ('watch', watch), ('meta', meta))
+        for attr, value in checked:
+            valid = valid_attr[attr]
+            if not (isinstance(value, valid[0]) or value in valid[1]):
+                self.check_attr(name, attr, value, valid)
 
         if '=' in name:
             msg = "Task '{}': name must not use the char '=' (equal sign)."
@@ -221,10 +261,7 @@ class Task(object):
         # actions
         self.io = IOConfig(io or {})
         self._action_instances = None
-        if actions is None:
-            self._actions = []
-        else:
-            self._actions = list(actions[:])
+        self._actions = [] if actions is None else list(actions)
 
         self._init_deps(dependencies, calc_dep)
 
@@ -278,9 +315,7 @@ class Task(object):
         self._init_dependencies(dependencies)
 
         # calc_dep
-        self.calc_dep = set()
-        if calc_dep:
-            self._expand_calc_dep(calc_dep)
+        self.calc_dep = set(calc_dep)
 
     def _init_dependencies(self, dependencies):
         """Initialize dependencies list from Dependency objects."""
@@ -380,17 +415,15 @@ class Task(object):
                 item.configure_task(self)
 
             # check/append uptodate value to task
-            if isinstance(item, bool) or item is None:
-                uptodate.append((item, None, None))
+            normalize = _UPTODATE_DISPATCH.get(type(item))
+            if normalize is not None:
+                uptodate.append(normalize(item))
             elif hasattr(item, '__call__'):
-                uptodate.append((item, [], {}))
+                uptodate.append(_uptodate_call(item))
             elif isinstance(item, tuple):
-                call = item[0]
-                args = list(item[1]) if len(item) > 1 else []
-                kwargs = item[2] if len(item) > 2 else {}
-                uptodate.append((call, args, kwargs))
+                uptodate.append(_uptodate_tuple(item))
             elif isinstance(item, str):
-                uptodate.append((item, [], {}))
+                uptodate.append(_uptodate_call(item))
             else:
                 msg = ("%s. task invalid 'uptodate' item '%r'. "
                        "Must be bool, None, str, callable or tuple "
@@ -401,9 +434,7 @@ class Task(object):
 
     def _expand_calc_dep(self, calc_dep):
         """calc_dep input"""
-        for dep in calc_dep:
-            if dep not in self.calc_dep:
-                self.calc_dep.add(dep)
+        self.calc_dep.update(calc_dep)
 
     def _extend_uptodate(self, uptodate):
         """add/extend uptodate values"""
@@ -475,6 +506,9 @@ class Task(object):
         """
         if self.options is None:
             self.options = {}
+            if not (self.params or self.creator_params or args):
+                # nothing to parse (most tasks): skip building a parser
+                return args
             all_opts = list(self.params) + self.creator_params
             taskcmd = TaskParse([normalize_option(opt) for opt in all_opts])
             if self.cfg_values is not None:
@@ -599,11 +633,10 @@ class Task(object):
 
                 # add extra arguments used by clean actions
                 execute_on_dryrun = False
-                if isinstance(action, PythonAction):
-                    action_sig = inspect.signature(action.py_callable)
-                    if 'dryrun' in action_sig.parameters:
-                        execute_on_dryrun = True
-                        action.kwargs['dryrun'] = dryrun
+                if (isinstance(action, PythonAction) and
+                        _accepts_dryrun(action.py_callable)):
+                    execute_on_dryrun = True
+                    action.kwargs['dryrun'] = dryrun
 
                 if (not dryrun) or execute_on_dryrun:
                     result = action.execute(out=outstream)
@@ -631,6 +664,9 @@ class Task(object):
         return self.name < other.name
 
 
+# fields accepted in a task dict (including legacy file_dep/task_dep)
+_VALID_TASK_ATTRS = frozenset(Task.valid_attr)
+
 
 def dict_to_task(task_dict):
     """Create a task instance from dictionary.
@@ -647,12 +683,13 @@ def dict_to_task(task_dict):
                           (task_dict['name'], task_dict))
 
     # user friendly. dont go ahead with invalid input.
-    task_attrs = list(task_dict.keys())
-    valid_attrs = set(Task.valid_attr.keys())
-    for key in task_attrs:
-        if key not in valid_attrs:
-            name = task_dict['name']
-            raise InvalidTask(f"Task {name} contains invalid field: '{key}'")
+    if not _VALID_TASK_ATTRS.issuperset(task_dict):
+        # report the first invalid field, in dict order
+        for key in task_dict:
+            if key not in _VALID_TASK_ATTRS:
+                name = task_dict['name']
+                raise InvalidTask(
+                    f"Task {name} contains invalid field: '{key}'")
 
     # Convert legacy file_dep/task_dep to dependencies
     task_dict = _convert_legacy_deps(task_dict)
@@ -701,6 +738,19 @@ def _convert_legacy_deps(task_dict):
 
 
 
+def _accepts_dryrun(py_callable):
+    """check if a python-action clean callable takes a `dryrun` parameter"""
+    try:
+        return _accepts_dryrun_cached(py_callable)
+    except TypeError:  # unhashable callable
+        return 'dryrun' in inspect.signature(py_callable).parameters
+
+
+@lru_cache(maxsize=256)
+def _accepts_dryrun_cached(py_callable):
+    return 'dryrun' in inspect.signature(py_callable).parameters
+
+
 def clean_targets(task, dryrun):
     """remove all targets from a task"""
     for target in sorted(task.targets, reverse=True):
@@ -769,9 +819,16 @@ class result_dep(UptodateCalculator):
         dep_task = self.tasks_dict[self.dep_name]
         dep_result = self._get_dep_result(dep_task)
 
-        def result_saver():
-            # get latest value after execution of dependent task
-            return {self.result_name: self._get_dep_result(dep_task)}
+        if self.setup_dep:
+            def result_saver():
+                # setup tasks only run after this check (if the task is
+                # not up-to-date): get latest value after their execution
+                return {self.result_name: self._get_dep_result(dep_task)}
+        else:
+            def result_saver():
+                # a task_dep was already executed before this check,
+                # its result can not change until the task is saved
+                return {self.result_name: dep_result}
         task.value_savers.append(result_saver)
 
         last_success = values.get(self.result_name)
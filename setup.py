@@ -153,6 +153,7 @@ setup(name = 'doit',
           'cloudpickle': ['cloudpickle; platform_python_implementation!="pypy"'],
           'yaml': ['pyyaml>=6.0'],
           's3': ['boto3'],
+          'blake3': ['blake3'],
       },
       long_description = long_description,
       entry_points = {
@@ -1,4 +1,5 @@
 import os
+import hashlib
 import time
 from sys import executable
 
@@ -6,9 +7,10 @@ import pytest
 
 from doit.task import Task
 from doit.deps import FileDependency, TaskDependency
-from doit.dependency import get_md5, get_file_md5
+from doit.dependency import get_md5, get_file_md5, get_file_blake2
 from doit.dependency import DbmDB, Dependency
 from doit.dependency import DatabaseException, UptodateCalculator
+from doit.dependency import StorageKey
 from doit.dependency import FileChangedChecker, MD5Checker, TimestampChecker
 from doit.dependency import DependencyStatus, DependencyReason
 from .conftest import get_abspath, dep_manager_fixture
@@ -34,6 +36,23 @@ def test_md5():
     assert get_file_md5(filePath) in {expected_lf, expected_crlf}
 
 
+def test_md5_empty_file(tmp_path):
+    # empty files can not be mmap'ed, fallback to reading
+    empty = tmp_path / "empty"
+    empty.write_bytes(b"")
+    assert get_file_md5(str(empty)) == "d41d8cd98f00b204e9800998ecf8427e"
+
+
+def test_blake2(tmp_path):
+    data = tmp_path / "data"
+    data.write_bytes(b"doit")
+    expected = hashlib.blake2b(b"doit", digest_size=16).hexdigest()
+    assert get_file_blake2(str(data)) == expected
+    data.write_bytes(b"")
+    expected = hashlib.blake2b(b"", digest_size=16).hexdigest()
+    assert get_file_blake2(str(data)) == expected
+
+
 def test_sqlite_import():
     """
     Checks that SQLite module is not imported until the SQLite class is instantiated
@@ -175,6 +194,18 @@ class TestDependencyDb(object):
         assert None == pdep_manager._get("taskId_ZZZ", "dep_2")
         assert None == pdep_manager._get("taskId_YYY", "dep_1")
 
+    def test_remove_drops_file_digests(self, pdep_manager):
+        digests = StorageKey.FILE_DIGESTS
+        pdep_manager._set("taskId_ZZZ", StorageKey.DEPS, ("/dep_1",))
+        pdep_manager._set("taskId_YYY", StorageKey.DEPS, ("/dep_2",))
+        pdep_manager._set(digests + "/dep_1", "md5", (1, 2, "x"))
+        pdep_manager._set(digests + "/dep_2", "md5", (1, 2, "y"))
+        pdep_manager.remove("taskId_ZZZ")
+        # only the digests of the forgotten task's files are dropped
+        assert None == pdep_manager._get(digests + "/dep_1", "md5")
+        assert [1, 2, "y"] == list(pdep_manager._get(digests + "/dep_2", "md5"))
+        assert pdep_manager._in("taskId_YYY")
+
 
 class TestSaveSuccess(object):
 
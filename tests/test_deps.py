@@ -1,16 +1,19 @@
 """Tests for doit.deps module - Dependency classes."""
 
 import os
+import sys
 import time
 import pytest
 from pathlib import Path
 
+from doit import deps
 from doit.deps import (
     Dependency, FileDependency, TaskDependency,
-    Target, FileTarget, CheckStatus, DependencyCheckResult
+    Target, FileTarget, CheckStatus, DependencyCheckResult, stat_cache
 )
 from doit.task import Task
 from doit.dependency import (
+    get_file_blake2, get_file_md5,
     Dependency as DepManager, InMemoryStateStore, MD5Checker,
     TimestampChecker, TaskState, UpToDateChecker
 )
@@ -34,6 +37,57 @@ class TestFileDependency:
         assert os.path.isabs(key)
         assert key.endswith("relative/path.txt")
 
+    def test_get_key_resolves_directory_symlinks(self, tmp_path):
+        """The directory part is resolved, a symlinked file is not."""
+        real = tmp_path.resolve() / "real"
+        real.mkdir()
+        (tmp_path / "link").symlink_to(real)
+        (real / "f.txt").write_text("x")
+        (real / "alias.txt").symlink_to(real / "f.txt")
+        path = str(tmp_path / "link" / "sub" / ".." / "f.txt")
+
+        # ".." is applied after resolving "link", not lexically
+        (real / "sub").mkdir()
+        assert FileDependency(path).get_key() == str(real / "f.txt")
+        alias = str(tmp_path / "link" / "alias.txt")
+        assert FileDependency(alias).get_key() == str(real / "alias.txt")
+        assert (FileDependency(alias, strict_resolve=True).get_key() ==
+                str(real / "f.txt"))
+
+    def test_get_key_same_for_relative_and_absolute(self, tmp_path,
+                                                    monkeypatch):
+        """A relative path from a symlinked cwd gets the absolute path's key."""
+        real = tmp_path.resolve() / "real"
+        real.mkdir()
+        (tmp_path / "link").symlink_to(real)
+        monkeypatch.chdir(tmp_path / "link")
+        assert (FileDependency("f.txt").get_key() ==
+                FileTarget(str(real / "f.txt")).get_key() ==
+                FileTarget(str(tmp_path / "link" / "f.txt")).get_key())
+
+    def test_get_key_sees_repointed_directory_symlink(self, tmp_path):
+        """Resolved directories are only memoized inside a check pass."""
+        one = tmp_path.resolve() / "one"
+        two = tmp_path.resolve() / "two"
+        one.mkdir()
+        two.mkdir()
+        link = tmp_path / "link"
+        link.symlink_to(one)
+        path = str(link / "f.txt")
+        with stat_cache():
+            assert FileDependency(path).get_key() == str(one / "f.txt")
+            link.unlink()
+            link.symlink_to(two)
+            assert FileDependency(path).get_key() == str(one / "f.txt")
+        assert FileDependency(path).get_key() == str(two / "f.txt")
+
+    def test_get_key_resolved_once(self, tmp_path, monkeypatch):
+        """get_key() is resolved on creation, not on every call."""
+        monkeypatch.chdir(tmp_path)
+        dep = FileDependency("relative.txt")
+        monkeypatch.chdir(tmp_path.parent)
+        assert dep.get_key() == str(tmp_path.resolve() / "relative.txt")
+
     def test_exists_true_when_file_exists(self, tmp_path):
         """exists() returns True when file exists."""
         f = tmp_path / "exists.txt"
@@ -66,6 +120,34 @@ class TestFileDependency:
         # Same state should not be modified
         assert dep.is_modified(state) is False
 
+    def test_is_modified_recent_timestamp_checks_md5(self, tmp_path):
+        """is_modified() does not trust a timestamp that is too recent."""
+        f = tmp_path / "racy.txt"
+        f.write_text("original")
+
+        dep = FileDependency(str(f))
+        state = dep.get_state(None)
+        mtime_ns = f.stat().st_mtime_ns
+
+        # same size and mtime, but content changed
+        f.write_text("modified")
+        os.utime(f, ns=(mtime_ns, mtime_ns))
+        assert f.stat().st_mtime == state[0]
+        assert dep.is_modified(state) is True
+
+    def test_is_modified_size_change_with_same_timestamp(self, tmp_path):
+        """is_modified() detects a size change even if mtime is unchanged."""
+        f = tmp_path / "grow.txt"
+        f.write_text("data")
+        os.utime(f, (1000000, 1000000))
+
+        dep = FileDependency(str(f))
+        state = dep.get_state(None)
+
+        f.write_text("more data")
+        os.utime(f, (1000000, 1000000))
+        assert dep.is_modified(state) is True
+
     def test_is_modified_true_when_content_changes(self, tmp_path):
         """is_modified() detects content changes."""
         f = tmp_path / "changing.txt"
@@ -126,6 +208,8 @@ class TestFileDependency:
         """get_state() returns None when timestamp unchanged (optimization)."""
         f = tmp_path / "opt.txt"
         f.write_text("content")
+        # recent timestamps are not trusted, use an old one
+        os.utime(f, (1000000, 1000000))
 
         dep = FileDependency(str(f))
         state1 = dep.get_state(None)
@@ -134,6 +218,82 @@ class TestFileDependency:
         state2 = dep.get_state(state1)
         assert state2 is None
 
+    @pytest.mark.skipif(sys.version_info < (3, 10),
+                        reason="dataclass slots require python 3.10")
+    @pytest.mark.parametrize('make', [
+        lambda p: FileDependency(p),
+        lambda p: FileTarget(p),
+        lambda p: TaskDependency('t'),
+        lambda p: deps.DirectoryDependency(p),
+        lambda p: deps.DirectoryTarget(p),
+        lambda p: deps.S3Dependency('bucket', 'key'),
+        lambda p: deps.S3Target('bucket', 'key'),
+        lambda p: deps.S3PrefixDependency('bucket', 'prefix/'),
+        lambda p: deps.S3PrefixTarget('bucket', 'prefix/'),
+    ])
+    def test_uses_slots(self, tmp_path, make):
+        """Dependency and target instances have no __dict__."""
+        assert not hasattr(make(str(tmp_path / "x.txt")), '__dict__')
+
+    def test_invalid_checker(self, tmp_path):
+        """Unknown checker names are rejected."""
+        with pytest.raises(ValueError, match="Invalid checker"):
+            FileDependency(str(tmp_path / "x.txt"), checker="sha7")
+
+    def test_stored_state_shape(self, tmp_path):
+        """Malformed states are modified, JSON decoded (list) states are not."""
+        f = tmp_path / "shape.txt"
+        f.write_text("content")
+        os.utime(f, (1000000, 1000000))
+        dep = FileDependency(str(f))
+        state = dep.get_state(None)
+        assert dep.is_modified(list(state)) is False
+        assert dep.is_modified(state[:2]) is True
+        assert dep.is_modified("abc") is True
+        assert dep.is_modified(12.5) is True
+        assert dep.is_modified((state[0], state[1], 'blake3', state[2])) is True
+
+    def test_blake3_checker(self, tmp_path):
+        """blake3 checker stores a tagged state and detects changes."""
+        blake3 = pytest.importorskip("blake3")
+        f = tmp_path / "b3.txt"
+        f.write_text("content")
+
+        dep = FileDependency(str(f), checker="blake3")
+        state = dep.get_state(None)
+        assert len(state) == 4
+        assert state[2] == "blake3"
+        assert state[3] == blake3.blake3(b"content").hexdigest()
+        assert dep.is_modified(state) is False
+
+        # same size, new timestamp: decided by the hash
+        f.write_text("CONTENT")
+        os.utime(f, (state[0] + 5, state[0] + 5))
+        assert dep.is_modified(state) is True
+
+    def test_blake2_checker(self, tmp_path):
+        """blake2 checker stores a tagged state, not mixed with md5 ones."""
+        f = tmp_path / "b2.txt"
+        f.write_text("content")
+        os.utime(f, (1000000, 1000000))
+
+        dep = FileDependency(str(f), checker="blake2")
+        state = dep.get_state(None)
+        assert state[2:] == ("blake2", get_file_blake2(str(f)))
+        assert dep.is_modified(state) is False
+        assert dep.is_modified(FileDependency(str(f)).get_state(None)) is True
+
+    def test_blake3_checker_ignores_md5_state(self, tmp_path):
+        """A state saved by another hash checker is considered modified."""
+        pytest.importorskip("blake3")
+        f = tmp_path / "switch.txt"
+        f.write_text("content")
+
+        md5_state = FileDependency(str(f)).get_state(None)
+        dep = FileDependency(str(f), checker="blake3")
+        assert dep.is_modified(md5_state) is True
+        assert dep.get_state(md5_state)[2] == "blake3"
+
     def test_creates_task_dep_returns_none(self, tmp_path):
         """FileDependency.creates_task_dep() returns None."""
         f = tmp_path / "test.txt"
@@ -142,6 +302,160 @@ class TestFileDependency:
         assert dep.creates_task_dep() is None
 
 
+class TestStatCache:
+    """Tests for stat_cache() memoization of file stats."""
+
+    def test_stat_shared_inside_block(self, tmp_path, monkeypatch):
+        f = tmp_path / "cached.txt"
+        f.write_text("content")
+        os.utime(f, (1000000, 1000000))
+        dep = FileDependency(str(f))
+        state = dep.get_state(None)
+
+        calls = []
+        real_stat = os.stat
+        def counting_stat(path, *args, **kwargs):
+            calls.append(path)
+            return real_stat(path, *args, **kwargs)
+        monkeypatch.setattr(deps.os, 'stat', counting_stat)
+
+        with stat_cache():
+            assert dep.exists() is True
+            assert dep.is_modified(state) is False
+            assert dep.get_state(state) is None
+            assert FileTarget(str(f)).exists() is True
+        assert len(calls) == 1
+
+    def test_no_caching_outside_block(self, tmp_path):
+        f = tmp_path / "uncached.txt"
+        f.write_text("content")
+        dep = FileDependency(str(f))
+        with stat_cache():
+            assert dep.exists() is True
+        f.unlink()
+        assert dep.exists() is False
+
+    def test_nested_blocks_share_cache(self):
+        with stat_cache() as outer:
+            with stat_cache() as inner:
+                assert inner is outer
+
+    def test_not_shared_with_other_threads(self):
+        import threading
+        seen = []
+        with stat_cache():
+            thread = threading.Thread(
+                target=lambda: seen.append(deps._file_cache.get()))
+            thread.start()
+            thread.join()
+        assert seen == [None]
+
+    def test_digest_per_checker(self, tmp_path):
+        f = tmp_path / "hashed.txt"
+        f.write_text("hello")
+        with stat_cache():
+            md5 = FileDependency(str(f), checker='md5').get_state(None)
+            blake2 = FileDependency(str(f), checker='blake2').get_state(None)
+        assert md5[-1] == get_file_md5(f)
+        assert blake2[-1] == get_file_blake2(f)
+        assert md5[-1] != blake2[-1]
+
+    def test_missing_file_not_cached(self, tmp_path):
+        f = tmp_path / "late.txt"
+        dep = FileDependency(str(f))
+        with stat_cache():
+            assert dep.exists() is False
+            f.write_text("content")
+            assert dep.exists() is True
+
+
+class TestPersistedDigests:
+    """Tests for content digests persisted in the state store."""
+
+    @pytest.fixture
+    def hash_calls(self, monkeypatch):
+        calls = []
+        def counting_md5(path):
+            calls.append(path)
+            return get_file_md5(path)
+        monkeypatch.setitem(FileDependency.HASHERS, 'md5', counting_md5)
+        return calls
+
+    def test_digest_reused_by_other_dependency(self, tmp_path, hash_calls):
+        f = tmp_path / "shared.txt"
+        f.write_text("content")
+        os.utime(f, (1000000, 1000000))
+        store = InMemoryStateStore()
+        with stat_cache(store):
+            state = FileDependency(str(f)).get_state(None)
+        assert len(hash_calls) == 1
+
+        # touched: timestamp changed, content did not
+        os.utime(f, (2000000, 2000000))
+        with stat_cache(store):
+            assert FileDependency(str(f)).is_modified(state) is False
+        assert len(hash_calls) == 2
+        with stat_cache(store):
+            assert FileDependency(str(f)).is_modified(state) is False
+            assert FileDependency(str(f)).get_state(None)[2] == state[2]
+        assert len(hash_calls) == 2
+
+    def test_stale_digest_not_used(self, tmp_path, hash_calls):
+        f = tmp_path / "changed.txt"
+        f.write_text("content")
+        os.utime(f, (1000000, 1000000))
+        store = InMemoryStateStore()
+        with stat_cache(store):
+            state = FileDependency(str(f)).get_state(None)
+        f.write_text("CONTENT")
+        os.utime(f, (2000000, 2000000))
+        with stat_cache(store):
+            assert FileDependency(str(f)).is_modified(state) is True
+        assert len(hash_calls) == 2
+
+    def test_recent_file_not_persisted(self, tmp_path, hash_calls):
+        f = tmp_path / "recent.txt"
+        f.write_text("content")
+        store = InMemoryStateStore()
+        with stat_cache(store):
+            FileDependency(str(f)).get_state(None)
+        assert store.get(deps.StorageKey.FILE_DIGESTS + str(f), 'md5') is None
+
+    def test_checker_must_match(self, tmp_path):
+        f = tmp_path / "algo.txt"
+        f.write_text("content")
+        os.utime(f, (1000000, 1000000))
+        store = InMemoryStateStore()
+        with stat_cache(store) as cache:
+            FileDependency(str(f)).get_state(None)
+            file_stat = os.stat(f)
+            assert cache.stored_digest(str(f), 'md5', file_stat) is not None
+            assert cache.stored_digest(str(f), 'blake3', file_stat) is None
+
+    def test_digests_persisted_per_checker(self, tmp_path):
+        f = tmp_path / "algos.txt"
+        f.write_text("content")
+        os.utime(f, (1000000, 1000000))
+        store = InMemoryStateStore()
+        with stat_cache(store):
+            md5 = FileDependency(str(f)).get_state(None)
+            blake2 = FileDependency(str(f), checker='blake2').get_state(None)
+        with stat_cache(store) as cache:
+            file_stat = os.stat(f)
+            assert cache.stored_digest(str(f), 'md5', file_stat) == md5[-1]
+            assert (cache.stored_digest(str(f), 'blake2', file_stat) ==
+                    blake2[-1])
+
+    def test_digest_not_saved(self, tmp_path, hash_calls):
+        f = tmp_path / "status.txt"
+        f.write_text("content")
+        os.utime(f, (1000000, 1000000))
+        store = InMemoryStateStore()
+        with stat_cache(store, save=False):
+            FileDependency(str(f)).get_state(None)
+        assert store.get(deps.StorageKey.FILE_DIGESTS + str(f), 'md5') is None
+
+
 class TestTaskDependency:
     """Tests for TaskDependency class."""
 
@@ -150,6 +464,12 @@ class TestTaskDependency:
         dep = TaskDependency("build")
         assert dep.get_key() == "task:build"
 
+    def test_get_key_interned(self):
+        """get_key() returns the same (interned) string object."""
+        key1 = TaskDependency('build').get_key()
+        key2 = TaskDependency('build').get_key()
+        assert key1 is key2
+
     def test_get_key_subtask(self):
         """get_key() handles subtask names."""
         dep = TaskDependency("build:lib")
@@ -257,6 +577,46 @@ class TestUpToDateCheckerWithDependencies:
         result = checker.check(task, {}, lambda x: {})
         assert result.status == 'run'
 
+    def test_dependencies_checked_in_batch_per_type(self, tmp_path):
+        """UpToDateChecker calls check_status_batch() once per type."""
+        batches = []
+
+        class ValueDependency(Dependency):
+            def __init__(self, name, changed):
+                self.name = name
+                self.changed = changed
+            def get_key(self):
+                return f"value:{self.name}"
+            def is_modified(self, stored_state):
+                return self.changed
+            def get_state(self, current_state):
+                return None
+            def exists(self):
+                return True
+            def check_status(self, stored_state):
+                status = (CheckStatus.CHANGED if self.changed
+                          else CheckStatus.UP_TO_DATE)
+                return DependencyCheckResult(status)
+            @classmethod
+            def check_status_batch(cls, deps_and_states):
+                batches.append([dep.name for dep, _ in deps_and_states])
+                return super().check_status_batch(deps_and_states)
+
+        f = tmp_path / "dep.txt"
+        f.write_text("content")
+        file_dep = FileDependency(str(f))
+        task = Task("test", actions=["echo"], dependencies=[
+            ValueDependency('a', False), file_dep,
+            ValueDependency('b', True), TaskDependency('other')])
+
+        store = InMemoryStateStore()
+        store.set("test", file_dep.get_key(), file_dep.get_state(None))
+        checker = UpToDateChecker(store, MD5Checker())
+        result = checker.check(task, {}, lambda x: {})
+        assert batches == [['a', 'b']]
+        assert result.status == 'run'
+        assert task.dep_changed == ['value:b']
+
     def test_task_dependency_doesnt_affect_uptodate(self, tmp_path):
         """TaskDependency doesn't affect up-to-date status."""
         f = tmp_path / "source.txt"
@@ -387,6 +747,40 @@ class TestFileTarget:
 
         assert target.matches_dependency(dep) is False
 
+    def test_matches_by_kind(self, tmp_path):
+        """Dependencies of the same KIND (e.g. subclasses) match by key."""
+        class GeneratedFile(FileDependency):
+            pass
+        target = FileTarget(str(tmp_path / "file.txt"))
+        assert target.matches_dependency(
+            GeneratedFile(str(tmp_path / "file.txt"))) is True
+        assert target.matches_dependency(
+            deps.DirectoryDependency(str(tmp_path / "file.txt"))) is False
+
+
+class TestDirectoryDependencyTarget:
+    """Tests for DirectoryDependency/DirectoryTarget."""
+
+    @pytest.mark.parametrize('cls', [deps.DirectoryDependency,
+                                     deps.DirectoryTarget])
+    def test_exists(self, tmp_path, cls):
+        (tmp_path / "file").write_text("x")
+        assert cls(tmp_path).exists() is True
+        assert cls(tmp_path / "file").exists() is False
+        assert cls(tmp_path / "missing").exists() is False
+        with stat_cache() as cache:
+            assert cls(tmp_path).exists() is True
+            assert cls(tmp_path).get_key() in cache.stats
+
+    @pytest.mark.parametrize('cls', [deps.DirectoryDependency,
+                                     deps.DirectoryTarget])
+    def test_key_resolved_once(self, tmp_path, monkeypatch, cls):
+        """get_key() has a trailing slash and does not resolve again."""
+        obj = cls(tmp_path / "out")
+        expected = str(tmp_path.resolve() / "out") + '/'
+        monkeypatch.setattr(Path, 'resolve', lambda self, strict=False: 1 / 0)
+        assert obj.get_key() == expected
+
 
 class TestIntegrationNewDependencies:
     """Integration tests for the new dependency system."""
@@ -492,6 +886,23 @@ class TestFileDependencyCheckStatus:
         assert result.needs_execution is False
         assert result.error_message is None
 
+    def test_check_status_single_stat(self, tmp_path, monkeypatch):
+        """check_status() stats the file only once."""
+        f = tmp_path / "once.txt"
+        f.write_text("content")
+        dep = FileDependency(str(f))
+        stored_state = dep.get_state(None)
+
+        calls = []
+        real_stat = os.stat
+        def counting_stat(path, *args, **kwargs):
+            calls.append(path)
+            return real_stat(path, *args, **kwargs)
+        monkeypatch.setattr(deps.os, 'stat', counting_stat)
+
+        assert dep.check_status(stored_state).is_up_to_date
+        assert len(calls) == 1
+
     def test_check_status_with_timestamp_checker(self, tmp_path):
         """check_status() works with timestamp checker."""
         f = tmp_path / "ts.txt"
@@ -512,6 +923,61 @@ class TestFileDependencyCheckStatus:
         assert result2.needs_execution is True
 
 
+class TestFileDependencyCheckStatusBatch:
+    """Tests for FileDependency.check_status_batch()."""
+
+    def test_batch_results_in_order(self, tmp_path):
+        same = tmp_path / "same.txt"
+        same.write_text("aaaa")
+        changed = tmp_path / "changed.txt"
+        changed.write_text("bbbb")
+        touched = tmp_path / "touched.txt"
+        touched.write_text("cccc")
+        missing = tmp_path / "missing.txt"
+
+        deps_ = [FileDependency(str(p))
+                 for p in (same, changed, touched, missing)]
+        states = [d.get_state(None) for d in deps_[:3]] + [None]
+
+        # same size, new timestamp: only the md5 tells them apart
+        changed.write_text("BBBB")
+        os.utime(changed, (states[1][0] + 5, states[1][0] + 5))
+        os.utime(touched, (states[2][0] + 5, states[2][0] + 5))
+
+        checks = list(zip(deps_ + [TaskDependency('t1')], states + [None]))
+        results = FileDependency.check_status_batch(checks, max_workers=2)
+        assert [r.status for r in results] == [
+            CheckStatus.UP_TO_DATE, CheckStatus.CHANGED,
+            CheckStatus.UP_TO_DATE, CheckStatus.ERROR,
+            CheckStatus.UP_TO_DATE]
+
+
+    def test_batch_file_gone_while_hashing(self, tmp_path, monkeypatch):
+        """A file that can't be hashed after its stat fails alone."""
+        files = [tmp_path / name for name in ("gone.txt", "busy.txt", "ok.txt")]
+        for f in files:
+            f.write_text("data")
+        deps_ = [FileDependency(str(f)) for f in files]
+        states = [d.get_state(None) for d in deps_]
+        for f, state in zip(files, states):
+            os.utime(f, (state[0] + 5, state[0] + 5))
+
+        real_md5 = FileDependency.HASHERS['md5']
+        def racing_md5(path):
+            if path == files[0]:
+                path.unlink()
+                raise FileNotFoundError(str(path))
+            if path == files[1]:
+                raise PermissionError(str(path))
+            return real_md5(path)
+        monkeypatch.setitem(FileDependency.HASHERS, 'md5', racing_md5)
+
+        results = FileDependency.check_status_batch(
+            list(zip(deps_, states)), max_workers=2)
+        assert [r.status for r in results] == [
+            CheckStatus.ERROR, CheckStatus.CHANGED, CheckStatus.UP_TO_DATE]
+
+
 class TestTaskDependencyCheckStatus:
     """Tests for TaskDependency.check_status() self-checking method."""
 
@@ -561,6 +1027,19 @@ class TestDependencyCheckResultProperties:
         assert DependencyCheckResult(CheckStatus.MISSING).is_error is False
         assert DependencyCheckResult(CheckStatus.ERROR).is_error is True
 
+    def test_lazy_reason(self):
+        """A callable reason is only formatted when read, and only once."""
+        calls = []
+        def reason():
+            calls.append(1)
+            return "lazy"
+        result = DependencyCheckResult(CheckStatus.CHANGED, reason=reason)
+        assert calls == []
+        assert result.reason == "lazy"
+        assert result.reason == "lazy"
+        assert calls == [1]
+        assert result == DependencyCheckResult(CheckStatus.CHANGED, "lazy")
+
 
 class TestPathlibSupport:
     """Tests for pathlib.Path support in dependency classes."""
@@ -615,6 +1094,17 @@ class TestPathlibSupport:
 
         assert target.matches_dependency(dep) is True
 
+    def test_equality_and_hash_by_key(self, tmp_path):
+        """Dependencies/targets compare and hash by type and key."""
+        f = tmp_path / "eq.txt"
+        assert FileDependency(f) == FileDependency(str(f))
+        assert len({FileDependency(f), FileDependency(str(f))}) == 1
+        assert FileDependency(f) != FileTarget(f)
+        assert FileTarget(f) == FileTarget(str(f))
+        assert TaskDependency('a') == TaskDependency('a')
+        assert TaskDependency('a') != TaskDependency('b')
+        assert {TaskDependency('a'): 1}[TaskDependency('a')] == 1
+
     def test_file_dependency_path_equality(self, tmp_path):
         """FileDependency created from str and Path have same keys."""
         f = tmp_path / "equality_test.txt"
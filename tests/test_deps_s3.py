@@ -12,18 +12,35 @@ moto = pytest.importorskip("moto")
 
 from moto import mock_aws
 
+from doit import deps
 from doit.deps import (
-    S3Dependency, S3Target, CheckStatus, DependencyCheckResult
+    S3Dependency, S3Target, CheckStatus, DependencyCheckResult, stat_cache
 )
 
 
 @pytest.fixture
 def s3_bucket():
     """Mocked S3 bucket for testing."""
+    # shared clients must not outlive the mock
+    deps._s3_client.cache_clear()
     with mock_aws():
         client = boto3.client('s3', region_name='us-east-1')
         client.create_bucket(Bucket='test-bucket')
         yield client
+    deps._s3_client.cache_clear()
+
+
+@pytest.fixture
+def head_calls(s3_bucket, monkeypatch):
+    """Record the keys of HEAD requests sent by the shared client."""
+    calls = []
+    client = deps._s3_client(None, None)
+    real_head = client.head_object
+    def counting_head(**kwargs):
+        calls.append(kwargs['Key'])
+        return real_head(**kwargs)
+    monkeypatch.setattr(client, 'head_object', counting_head)
+    return calls
 
 
 class TestS3Dependency:
@@ -34,6 +51,11 @@ class TestS3Dependency:
         dep = S3Dependency('bucket', 'path/file.csv')
         assert dep.get_key() == 's3://bucket/path/file.csv'
 
+    def test_get_key_interned(self):
+        """Keys are built once and interned, matching compares by identity."""
+        dep = S3Dependency('bucket', 'path/file.csv')
+        assert dep.get_key() is S3Target('bucket', 'path/file.csv').get_key()
+
     def test_get_key_with_special_chars(self):
         """Test key with special characters in path."""
         dep = S3Dependency('bucket', 'path/to/file with spaces.csv')
@@ -138,12 +160,132 @@ class TestS3Dependency:
 
         assert result.status == CheckStatus.UP_TO_DATE
 
+    @pytest.mark.parametrize('body, status', [
+        (b'data', CheckStatus.UP_TO_DATE),
+        (b'new data', CheckStatus.CHANGED),
+        (None, CheckStatus.ERROR),
+    ])
+    def test_check_status_single_head(self, s3_bucket, head_calls, body, status):
+        """check_status sends one HEAD, conditional on the stored ETag."""
+        s3_bucket.put_object(Bucket='test-bucket', Key='test.txt', Body=b'data')
+        dep = S3Dependency('test-bucket', 'test.txt')
+        state = dep.get_state(None)
+        if body is None:
+            s3_bucket.delete_object(Bucket='test-bucket', Key='test.txt')
+        else:
+            s3_bucket.put_object(Bucket='test-bucket', Key='test.txt', Body=body)
+        del head_calls[:]
+        assert dep.check_status(state).status == status
+        assert head_calls == ['test.txt']
+
+    def test_head_shared_inside_stat_cache(self, s3_bucket, head_calls):
+        """exists/is_modified/get_state share one HEAD per check pass."""
+        s3_bucket.put_object(Bucket='test-bucket', Key='test.txt', Body=b'data')
+        dep = S3Dependency('test-bucket', 'test.txt')
+        state = dep.get_state(None)
+        del head_calls[:]
+        with stat_cache():
+            assert dep.exists() is True
+            assert dep.is_modified(state) is False
+            assert dep.get_state(state) is None
+            assert S3Target('test-bucket', 'test.txt').exists() is True
+        assert head_calls == ['test.txt']
+        # not cached across blocks
+        with stat_cache():
+            assert dep.exists() is True
+        assert len(head_calls) == 2
+
+    def test_only_missing_object_cached(self, s3_bucket, head_calls,
+                                        monkeypatch):
+        """A 404 is cached for the pass, other HEAD failures are not."""
+        from botocore.exceptions import ClientError
+        dep = S3Dependency('test-bucket', 'missing.txt')
+        with stat_cache():
+            assert dep.exists() is False
+            assert dep.exists() is False
+        assert head_calls == ['missing.txt']
+
+        client = deps._s3_client(None, None)
+        def denied_head(**kwargs):
+            head_calls.append(kwargs['Key'])
+            raise ClientError({'Error': {'Code': '403'}}, 'HeadObject')
+        monkeypatch.setattr(client, 'head_object', denied_head)
+        del head_calls[:]
+        with stat_cache():
+            assert dep.exists() is False
+            assert dep.exists() is False
+        assert head_calls == ['missing.txt', 'missing.txt']
+
     def test_profile_and_region(self):
         """Test that profile and region are stored."""
         dep = S3Dependency('bucket', 'key', profile='dev', region='eu-west-1')
         assert dep.profile == 'dev'
         assert dep.region == 'eu-west-1'
 
+    def test_client_shared(self, s3_bucket):
+        """Objects with the same profile/region share one client."""
+        dep1 = S3Dependency('test-bucket', 'a.txt', region='us-east-1')
+        dep2 = S3Dependency('test-bucket', 'b.txt', region='us-east-1')
+        target = S3Target('test-bucket', 'c.txt', region='us-east-1')
+        other = S3Dependency('test-bucket', 'a.txt', region='eu-west-1')
+        assert dep1._get_client() is dep2._get_client()
+        assert dep1._get_client() is target._get_client()
+        assert dep1._get_client() is not other._get_client()
+
+
+class TestS3DependencyBatch:
+    """Tests for S3Dependency.check_status_batch()."""
+
+    def test_listing_replaces_head_requests(self, s3_bucket, head_calls):
+        for name in ('a', 'b', 'c'):
+            s3_bucket.put_object(Bucket='test-bucket', Key=f'data/{name}.csv',
+                                 Body=name.encode())
+        s3_bucket.put_object(Bucket='test-bucket', Key='other.csv', Body=b'x')
+        dep_list = [S3Dependency('test-bucket', f'data/{name}.csv')
+                    for name in ('a', 'b', 'c')]
+        states = [dep.get_state(None) for dep in dep_list]
+        s3_bucket.put_object(Bucket='test-bucket', Key='data/c.csv', Body=b'new')
+        del head_calls[:]
+
+        results = S3Dependency.check_status_batch(
+            [(dep, list(state)) for dep, state in zip(dep_list, states)])
+        assert [r.status for r in results] == [
+            CheckStatus.UP_TO_DATE, CheckStatus.UP_TO_DATE, CheckStatus.CHANGED]
+        assert head_calls == []
+
+    def test_missing_object(self, s3_bucket, head_calls):
+        s3_bucket.put_object(Bucket='test-bucket', Key='data/a.csv', Body=b'a')
+        dep_list = [S3Dependency('test-bucket', 'data/a.csv'),
+                    S3Dependency('test-bucket', 'data/missing.csv')]
+        results = S3Dependency.check_status_batch(
+            [(dep, None) for dep in dep_list])
+        assert [r.status for r in results] == [
+            CheckStatus.CHANGED, CheckStatus.ERROR]
+        assert head_calls == []
+
+    def test_single_object_uses_head(self, s3_bucket, head_calls):
+        s3_bucket.put_object(Bucket='test-bucket', Key='data/a.csv', Body=b'a')
+        dep = S3Dependency('test-bucket', 'data/a.csv')
+        state = dep.get_state(None)
+        result, = S3Dependency.check_status_batch([(dep, state)])
+        assert result.status == CheckStatus.UP_TO_DATE
+        assert head_calls
+
+    def test_head_requests_share_pass_cache(self, s3_bucket, head_calls):
+        s3_bucket.create_bucket(Bucket='other-bucket')
+        s3_bucket.put_object(Bucket='test-bucket', Key='a.csv', Body=b'a')
+        s3_bucket.put_object(Bucket='other-bucket', Key='b.csv', Body=b'b')
+        dep_list = [S3Dependency('test-bucket', 'a.csv'),
+                    S3Dependency('other-bucket', 'b.csv'),
+                    S3Dependency('other-bucket', 'missing.csv', region='eu-west-1')]
+        with stat_cache() as cache:
+            results = S3Dependency.check_status_batch(
+                [(dep, None) for dep in dep_list], max_workers=3)
+            assert [r.status for r in results] == [
+                CheckStatus.CHANGED, CheckStatus.CHANGED, CheckStatus.ERROR]
+            assert sorted(head_calls) == ['a.csv', 'b.csv']
+            assert set(cache.s3_objects) == {dep.get_key() for dep in dep_list}
+
 
 class TestS3Target:
     """Tests for S3Target class."""
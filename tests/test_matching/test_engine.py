@@ -225,6 +225,22 @@ class TestMatchingEngineCaching:
         # Should now return the more specific match
         assert engine.find_producer(dep) == "task_b"
 
+    def test_exact_register_keeps_other_entries(self):
+        """Registering an exact target only invalidates its own key."""
+        engine = MatchingEngine()
+        engine.register_target(MockPrefixTarget("/data/"), "task_a")
+        dep_a = MockDependency("/data/a.txt")
+        dep_b = MockDependency("/data/b.txt")
+        missing = MockDependency("/other/c.txt")
+        assert engine.find_producer(dep_a) == "task_a"
+        assert engine.find_producer(dep_b) == "task_a"
+        assert engine.find_producer(missing) is None
+
+        engine.register_target(MockExactTarget("/data/b.txt"), "task_b")
+        assert engine._cache == {"/data/a.txt": "task_a", "/other/c.txt": None}
+        assert engine.find_producer(dep_b) == "task_b"
+        assert engine.find_producer(missing) is None
+
     def test_manual_cache_clear(self):
         """Test manual cache clearing."""
         engine = MatchingEngine()
@@ -260,6 +276,16 @@ class TestMatchingEngineFindAll:
         result = engine.find_all_producers(dep)
         assert set(result) == {"task_a", "task_b"}
 
+    def test_find_all_exact_and_prefix(self):
+        """An exact match does not hide prefix producers of the same key."""
+        engine = MatchingEngine()
+        engine.register_target(MockPrefixTarget("/data/"), "task_a")
+        engine.register_target(MockExactTarget("/data/file.txt"), "task_b")
+
+        dep = MockDependency("/data/file.txt")
+        assert engine.find_producer(dep) == "task_b"
+        assert engine.find_all_producers(dep) == ["task_b", "task_a"]
+
     def test_find_all_no_match(self):
         """Test find_all with no matches."""
         engine = MatchingEngine()
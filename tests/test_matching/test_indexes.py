@@ -1,5 +1,7 @@
 """Tests for index implementations."""
 
+import sys
+
 import pytest
 
 from doit.matching.indexes import ExactIndex, PrefixIndex, CustomIndex
@@ -40,6 +42,24 @@ class TestExactIndex:
         with pytest.raises(ValueError, match="Duplicate key"):
             index.register("/data/file.txt", "task_b")
 
+    def test_intern_names(self):
+        """Test that keys and task names are interned."""
+        index = ExactIndex()
+        index.register("".join(["/data/", "a.txt"]), "".join(["task_", "a"]))
+        ((key, name),) = index._by_key.items()
+        assert key is sys.intern("/data/a.txt")
+        assert name is sys.intern("task_a")
+
+    def test_duplicate_same_task_raises(self):
+        """Test that re-registering a key raises even for the same task."""
+        index = ExactIndex()
+        index.register("/data/file.txt", "task_a")
+
+        with pytest.raises(ValueError, match="Duplicate key"):
+            index.register("/data/file.txt", "task_a")
+        assert index.find("/data/file.txt") == "task_a"
+        assert len(index) == 1
+
     def test_contains(self):
         """Test contains method."""
         index = ExactIndex()
@@ -64,6 +84,7 @@ class TestPrefixIndex:
         """Test empty index returns None."""
         index = PrefixIndex()
         assert index.find("/any/path") is None
+        assert index.find_all("/any/path") == []
         assert len(index) == 0
 
     def test_register_and_find(self):
@@ -119,6 +140,18 @@ class TestPrefixIndex:
         assert index.contains("/data/output") is True  # Normalized
         assert index.contains("/data/") is False
 
+    def test_register_normalizes_once(self):
+        """Stored prefixes carry a trailing '/' and are interned."""
+        index = PrefixIndex()
+        index.register("/data/" + "output", "task_a")
+
+        ((stored, name),) = index._prefixes.items()
+        assert stored == "/data/output/"
+        assert stored is sys.intern("/data/output/")
+        assert name is sys.intern("task_a")
+        with pytest.raises(ValueError, match="Duplicate prefix"):
+            index.register("/data/output/", "task_b")
+
 
 class TestCustomIndex:
     """Tests for CustomIndex."""
@@ -188,6 +221,23 @@ class TestCustomIndex:
         # Should not raise, just returns None
         assert index.find("anything") is None
 
+    def test_matches_resolved_once(self):
+        """Test that matches() is looked up at registration only."""
+        lookups = []
+
+        class MockTarget:
+            def __getattr__(self, name):
+                lookups.append(name)
+                return lambda dep: dep == "hit"
+
+        index = CustomIndex()
+        index.register(MockTarget(), "task_a")
+
+        assert index.find("miss") is None
+        assert index.find("hit") == "task_a"
+        assert index.find_all("hit") == ["task_a"]
+        assert lookups == ["matches"]
+
     def test_len(self):
         """Test length tracking."""
         class MockTarget:
@@ -11,7 +11,7 @@ class TestTrieNode:
     def test_default_values(self):
         """Test default node initialization."""
         node = TrieNode()
-        assert node.children == {}
+        assert node.children is None
         assert node.value is None
         assert node.is_terminal is False
 
@@ -21,6 +21,13 @@ class TestTrieNode:
         assert node.value == "task_a"
         assert node.is_terminal is True
 
+    def test_slots(self):
+        """Test that nodes have no per-instance __dict__."""
+        node = TrieNode()
+        assert not hasattr(node, '__dict__')
+        with pytest.raises(AttributeError):
+            node.other = 1
+
 
 class TestPrefixTrieBasic:
     """Basic tests for PrefixTrie."""
@@ -129,6 +136,43 @@ class TestPrefixTrieContains:
         assert trie.contains("/data/output/subdir/") is False
 
 
+class TestPrefixTrieExactAndExtensions:
+    """Tests for get, __len__ and find_all_extensions."""
+
+    def test_get(self):
+        """Test exact lookup of stored values."""
+        trie = PrefixTrie()
+        trie.insert("/data/output/", "task_a")
+
+        assert trie.get("/data/output") == "task_a"
+        assert trie.get("/data/") is None
+        assert trie.get("/data/", "missing") == "missing"
+
+    def test_len(self):
+        """Test that len counts distinct prefixes."""
+        trie = PrefixTrie()
+        assert len(trie) == 0
+        trie.insert("/data/output/", "task_a")
+        trie.insert("/data/", "task_b")
+        trie.insert("/data/", "task_c")
+        assert len(trie) == 2
+
+    def test_find_all_extensions(self):
+        """Test finding prefixes registered under a key."""
+        trie = PrefixTrie()
+        trie.insert("/data/", "task_a")
+        trie.insert("/data/output/", "task_b")
+        trie.insert("/data/outlet/x/", "task_c")
+        trie.insert("/other/", "task_d")
+
+        assert set(trie.find_all_extensions("/data")) == {
+            "task_a", "task_b", "task_c"}
+        assert trie.find_all_extensions("/data/outlet/") == ["task_c"]
+        assert trie.find_all_extensions("/data/out") == []
+        assert trie.find_all_extensions("/missing/") == []
+        assert len(trie.find_all_extensions("")) == 4
+
+
 class TestPrefixTrieEdgeCases:
     """Edge case tests for PrefixTrie."""
 
@@ -179,3 +223,83 @@ class TestPrefixTrieEdgeCases:
 
         assert trie.find_longest_prefix("s3://bucket/prefix/key.txt") == "task_a"
         assert trie.find_longest_prefix("s3://bucket/other/key.txt") is None
+
+
+class TestPrefixTrieCompression:
+    """Tests for radix node compression."""
+
+    def test_single_branch_is_one_node(self):
+        """A chain without branching is stored as a single node."""
+        trie = PrefixTrie()
+        trie.insert("/home/user/project/out/", "task_a")
+
+        node = trie._root.children["h"]
+        assert node.label == "home/user/project/out/"
+        assert node.children is None
+        assert node.value == "task_a"
+
+    def test_split_on_divergence(self):
+        """Inserting a diverging prefix splits the shared node."""
+        trie = PrefixTrie()
+        trie.insert("/home/user/a/x/", "task_a")
+        trie.insert("/home/user/b/", "task_b")
+        trie.insert("/home/", "task_c")
+
+        home = trie._root.children["h"]
+        assert home.label == "home/"
+        assert home.value == "task_c"
+        user = home.children["u"]
+        assert user.label == "user/"
+        assert user.is_terminal is False
+        assert user.children["a"].label == "a/x/"
+        assert user.children["b"].label == "b/"
+
+        assert trie.find_longest_prefix("/home/user/a/x/f") == "task_a"
+        assert trie.find_longest_prefix("/home/user/a/y/f") == "task_c"
+        assert trie.find_longest_prefix("/home/user/b/f") == "task_b"
+        assert trie.find_all_prefixes("/home/user/a/x/f") == [
+            "task_c", "task_a"]
+        assert trie.contains("/home/user/") is False
+        assert trie.contains("/home/user/a/") is False
+        assert trie.contains("/home/user/a/x/") is True
+
+    def test_key_shorter_than_label(self):
+        """A key ending inside a compressed label does not match it."""
+        trie = PrefixTrie()
+        trie.insert("/a/b/c/", "task_a")
+
+        assert trie.find_longest_prefix("/a/b") is None
+        assert trie.find_all_prefixes("/a/b") == []
+
+    def test_split_inside_component(self):
+        """Labels may split mid-component without matching partial names."""
+        trie = PrefixTrie()
+        trie.insert("/data/output/", "task_a")
+        trie.insert("/data/outlet/", "task_b")
+
+        assert trie._root.children["d"].label == "data/out"
+        assert trie.find_longest_prefix("/data/output/f") == "task_a"
+        assert trie.find_longest_prefix("/data/outlet") == "task_b"
+        assert trie.find_longest_prefix("/data/out/f") is None
+        assert trie.find_longest_prefix("/data/outputs/f") is None
+        assert trie.contains("/data/out/") is False
+
+    def test_key_ends_before_split_separator(self):
+        """A key ending where only the trailing separator was split off."""
+        trie = PrefixTrie()
+        trie.insert("/tmp/data/out/", "out")
+        trie.insert("/tmp/data/output/", "output")
+
+        assert trie.find_longest_prefix("/tmp/data/out") == "out"
+        assert trie.find_all_prefixes("/tmp/data/out") == ["out"]
+        assert trie.find_longest_prefix("/tmp/data/output") == "output"
+        assert trie.find_longest_prefix("/tmp/data/ou") is None
+
+    def test_empty_components_ignored(self):
+        """Repeated separators in keys and prefixes are collapsed."""
+        trie = PrefixTrie()
+        trie.insert("//data//output/", "task_a")
+
+        assert trie.find_longest_prefix("/data/output//file") == "task_a"
+        assert trie.find_longest_prefix("data///output/file") == "task_a"
+        assert trie.contains("data/output") is True
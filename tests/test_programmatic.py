@@ -796,6 +796,24 @@ class TestConcurrentExecution:
                     task.execute_and_submit()
             assert engine.has_pending_tasks is False
 
+    def test_has_pending_tasks_while_iterating(self):
+        """Test has_pending_tasks counts selected tasks not dispatched yet."""
+        tasks = [
+            {'name': 'setup1', 'actions': [action_success]},
+            # up-to-date, so its setup task is never yielded
+            {'name': 'task1', 'actions': [action_success],
+             'setup': ['setup1'], 'uptodate': [True]},
+            {'name': 'task2', 'actions': [action_success]},
+        ]
+        pending = []
+        with DoitEngine(tasks, store=in_memory_store(),
+                        selected=['task1', 'task2']) as engine:
+            for task in engine:
+                if task.should_run:
+                    task.execute_and_submit()
+                pending.append((task.name, engine.has_pending_tasks))
+        assert pending == [('task1', True), ('task2', False)]
+
     def test_get_ready_tasks_returns_independent_tasks(self):
         """Test get_ready_tasks returns tasks without dependencies."""
         tasks = [
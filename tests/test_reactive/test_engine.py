@@ -112,6 +112,20 @@ class TestGetTaskOutputs:
         assert "/new/output.txt" in outputs
         assert "/legacy/target.txt" in outputs
 
+    def test_outputs_without_get_key_skipped(self):
+        """Test that outputs lacking get_key() are ignored."""
+        engine = ReactiveEngine(generators=[])
+
+        task = MagicMock()
+        target = MagicMock()
+        target.get_key.return_value = "/new/output.txt"
+        task.outputs = [object(), target]
+        task.targets = [Path("/legacy/path.txt"), "/legacy/target.txt"]
+
+        outputs = engine._get_task_outputs(task)
+
+        assert outputs == ["/new/output.txt", "/legacy/target.txt"]
+
     def test_no_outputs(self):
         """Test task with no outputs."""
         engine = ReactiveEngine(generators=[])
@@ -242,6 +256,52 @@ class TestReactiveEngineIntegration:
         # At least 2 tasks (stage1 and stage2 for 'source')
         assert result.tasks_executed >= 2
 
+    @pytest.mark.parametrize("batch_size, max_regenerations",
+                             [(1, 41), (16, 6)])
+    def test_batched_regeneration(self, tmp_path, batch_size,
+                                  max_regenerations):
+        """Test that outputs are regenerated in batches without losing tasks."""
+        from doit.taskgen import TaskGenerator, FileInput, FileOutput
+
+        (tmp_path / "raw").mkdir()
+        names = ["doc%02d" % i for i in range(20)]
+        for name in names:
+            (tmp_path / "raw" / f"{name}.txt").write_text(name)
+
+        stage2_executed = []
+
+        def write_action(record=None):
+            def action(inp, out, attrs):
+                def do_write():
+                    if record is not None:
+                        record.append(attrs["name"])
+                    Path(out[0]).parent.mkdir(parents=True, exist_ok=True)
+                    Path(out[0]).write_text(attrs["name"])
+                return do_write
+            return action
+
+        gen1 = TaskGenerator(
+            name="stage1:<name>",
+            inputs={"raw": FileInput("raw/<name>.txt", base_path=tmp_path)},
+            outputs=[FileOutput("mid/<name>.json", base_path=tmp_path)],
+            action=write_action(),
+        )
+        gen2 = TaskGenerator(
+            name="stage2:<name>",
+            inputs={"data": FileInput("mid/<name>.json", base_path=tmp_path)},
+            outputs=[FileOutput("final/<name>.out", base_path=tmp_path)],
+            action=write_action(stage2_executed),
+        )
+
+        engine = ReactiveEngine(generators=[gen1, gen2],
+                                regen_batch_size=batch_size)
+        result = engine.run()
+
+        assert sorted(stage2_executed) == names
+        assert result.tasks_executed == 40
+        # initial generation + one regeneration per flushed batch
+        assert result.regenerations <= max_regenerations
+
     def test_max_tasks_limit(self, tmp_path):
         """Test that max_tasks limit prevents infinite loops."""
         from doit.taskgen import TaskGenerator, FileInput, FileOutput
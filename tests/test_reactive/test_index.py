@@ -1,6 +1,7 @@
 """Tests for OutputPatternIndex."""
 
 import pytest
+from pathlib import Path
 from unittest.mock import MagicMock
 
 from doit.reactive.index import OutputPatternIndex
@@ -104,6 +105,63 @@ class TestGeneratorRegistration:
         assert index.prefix_count == 1
 
 
+class TestAbsolutePrefix:
+    """Tests for prefixes of inputs with a base_path."""
+
+    def test_absolute_prefix(self, tmp_path):
+        """Test that base_path inputs register a resolved prefix."""
+        index = OutputPatternIndex()
+
+        gen = MagicMock()
+        gen.inputs = {"data": MagicMock(pattern="raw/<doc>.json",
+                                        base_path=tmp_path)}
+        index.register_generator(gen)
+
+        output = str(tmp_path.resolve() / "raw" / "a.json")
+        assert index.find_affected_generators([output]) == [gen]
+
+    def test_resolve_cached(self, tmp_path, monkeypatch):
+        """Test that a base_path/prefix pair is resolved only once."""
+        calls = []
+        orig_resolve = Path.resolve
+
+        def resolve(self, *args, **kwargs):
+            calls.append(self)
+            return orig_resolve(self, *args, **kwargs)
+        monkeypatch.setattr(Path, 'resolve', resolve)
+
+        index = OutputPatternIndex()
+        for name in ("a", "b", "c"):
+            gen = MagicMock()
+            gen.inputs = {name: MagicMock(pattern="raw/<%s>.json" % name,
+                                          base_path=tmp_path)}
+            index.register_generator(gen)
+
+        assert calls == [tmp_path / "raw"]
+        assert index.prefix_count == 1
+
+    def test_relative_base_path_not_cached(self, tmp_path, monkeypatch):
+        """Test that a relative base_path resolves against the current cwd."""
+        (tmp_path / "one").mkdir()
+        (tmp_path / "two").mkdir()
+        index = OutputPatternIndex()
+
+        monkeypatch.chdir(tmp_path / "one")
+        assert (index._resolve_prefix(Path("."), "raw/") ==
+                str(tmp_path.resolve() / "one" / "raw") + '/')
+        monkeypatch.chdir(tmp_path / "two")
+        assert (index._resolve_prefix(Path("."), "raw/") ==
+                str(tmp_path.resolve() / "two" / "raw") + '/')
+
+    def test_clear_drops_resolved(self, tmp_path):
+        """Test that clear() empties the resolved prefix cache."""
+        index = OutputPatternIndex()
+        index._resolve_prefix(tmp_path, "raw/")
+        assert index._resolved
+        index.clear()
+        assert not index._resolved
+
+
 class TestFindAffectedGenerators:
     """Tests for finding affected generators."""
 
@@ -166,6 +224,37 @@ class TestFindAffectedGenerators:
         ])
         assert gen in affected
 
+    def test_outputs_iterator(self):
+        """Test that outputs may be any iterable, consumed once."""
+        index = OutputPatternIndex()
+
+        gen = MagicMock()
+        gen.inputs = {"data": MagicMock(pattern="processed/<doc>.json")}
+
+        index.register_generator(gen)
+
+        outputs = (p for p in ["other/x.txt", "processed/report.json"])
+        assert index.find_affected_generators(outputs) == [gen]
+
+    def test_stops_once_all_affected(self):
+        """Test that the batch stops once every generator is affected."""
+        index = OutputPatternIndex()
+
+        gen = MagicMock()
+        gen.inputs = {"data": MagicMock(pattern="processed/<doc>.json")}
+
+        index.register_generator(gen)
+
+        consumed = []
+
+        def outputs():
+            for path in ["processed/a.json", "processed/b.json"]:
+                consumed.append(path)
+                yield path
+
+        assert index.find_affected_generators(outputs()) == [gen]
+        assert consumed == ["processed/a.json"]
+
     def test_empty_outputs(self):
         """Test with empty outputs list."""
         index = OutputPatternIndex()
@@ -178,6 +267,61 @@ class TestFindAffectedGenerators:
         affected = index.find_affected_generators([])
         assert len(affected) == 0
 
+    def test_no_duplicates_first_seen_order(self):
+        """Test generators matched several times are returned once."""
+        index = OutputPatternIndex()
+
+        gen1 = MagicMock()
+        gen1.inputs = {
+            "a": MagicMock(pattern="data/<doc>.json"),
+            "b": MagicMock(pattern="data/raw/<doc>.csv"),
+        }
+        gen2 = MagicMock()
+        gen2.inputs = {"c": MagicMock(pattern="other/<doc>.txt")}
+
+        index.register_generators([gen1, gen2])
+
+        affected = index.find_affected_generators([
+            "other/x.txt", "data/raw/x.csv", "data/y.json"])
+        assert affected == [gen2, gen1]
+
+    def test_directory_output_contains_prefix(self):
+        """Test that a directory output matches prefixes below it."""
+        index = OutputPatternIndex()
+
+        gen1 = MagicMock()
+        gen1.inputs = {"data": MagicMock(pattern="out/processed/<doc>.json")}
+        gen2 = MagicMock()
+        gen2.inputs = {"data": MagicMock(pattern="other/<doc>.json")}
+
+        index.register_generators([gen1, gen2])
+
+        assert index.find_affected_generators(["out"]) == [gen1]
+        assert index.find_affected_generators(["out/"]) == [gen1]
+
+    def test_partial_component_no_match(self):
+        """Test that prefixes only match on whole path components."""
+        index = OutputPatternIndex()
+
+        gen = MagicMock()
+        gen.inputs = {"data": MagicMock(pattern="out/<doc>.json")}
+
+        index.register_generator(gen)
+
+        assert index.find_affected_generators(["output/doc.json"]) == []
+        assert index.find_affected_generators(["ou"]) == []
+
+    def test_empty_prefix_matches_everything(self):
+        """Test that a pattern without a static prefix matches any output."""
+        index = OutputPatternIndex()
+
+        gen = MagicMock()
+        gen.inputs = {"data": MagicMock(pattern="<name>.txt")}
+
+        index.register_generator(gen)
+
+        assert index.find_affected_generators(["any/where.txt"]) == [gen]
+
 
 class TestPathNormalization:
     """Tests for path normalization."""
@@ -198,15 +342,19 @@ class TestPathNormalization:
         assert gen in affected1
         assert gen in affected2
 
-    def test_s3_uri_handling(self):
-        """Test S3 URI normalization."""
+    def test_s3_output_trailing_slash(self):
+        """Test S3 outputs match with or without trailing slash."""
         index = OutputPatternIndex()
 
-        normalized = index._normalize_path("s3://bucket/path/to/file")
-        assert normalized == "s3://bucket/path/to/file"
+        gen = MagicMock()
+        gen.inputs = {"data": MagicMock(pattern="s3://bucket/raw/<doc>.json")}
+
+        index.register_generator(gen)
 
-        normalized = index._normalize_path("s3://bucket/path/")
-        assert normalized == "s3://bucket/path"
+        assert index.find_affected_generators(["s3://bucket/raw/a.json"]) == [gen]
+        assert index.find_affected_generators(["s3://bucket/raw/"]) == [gen]
+        assert index.find_affected_generators(["s3://bucket/"]) == [gen]
+        assert index.find_affected_generators(["s3://other/raw/"]) == []
 
 
 class TestClear:
@@ -108,6 +108,32 @@ class TestRegenerateAll:
         assert task1 in tasks
         assert task2 in tasks
 
+    def test_regenerate_all_threaded(self):
+        """Test that threaded generation keeps generator order."""
+        gens = [
+            make_mock_generator("gen%d" % i, {"data": "d%d/<x>.txt" % i},
+                                ["task%d-a" % i, "task%d-b" % i])
+            for i in range(10)
+        ]
+
+        manager = GeneratorManager(generators=gens, generate_workers=4)
+        tasks = manager.regenerate_all()
+
+        assert tasks == ["task%d-%s" % (i, s)
+                         for i in range(10) for s in "ab"]
+
+
+    def test_iter_regenerate_all_is_lazy(self):
+        """Test that the streaming variant runs generators on demand."""
+        gen1 = make_mock_generator("gen1", {"data": "a/<x>.txt"}, ["t1"])
+        gen2 = make_mock_generator("gen2", {"data": "b/<x>.txt"}, ["t2"])
+        manager = GeneratorManager(generators=[gen1, gen2])
+
+        tasks = manager.iter_regenerate_all()
+        assert next(tasks) == "t1"
+        gen2.generate.assert_not_called()
+        assert list(tasks) == ["t2"]
+
 
 class TestRegenerateAffected:
     """Tests for regenerate_affected method."""
@@ -221,3 +247,33 @@ class TestClear:
         manager.add_generator(gen2)
 
         assert manager.generator_count == 1
+
+    def test_clear_then_add_finds_only_new(self):
+        """Test that the index tracks clear() and add_generator()."""
+        gen1 = make_mock_generator("gen1", {"data": "processed/<doc>.json"})
+        manager = GeneratorManager(generators=[gen1])
+
+        manager.clear()
+        gen2 = make_mock_generator("gen2", {"raw": "raw/<file>.txt"})
+        manager.add_generator(gen2)
+
+        assert manager.find_affected_generators(["raw/a.txt"]) == [gen2]
+        assert manager.find_affected_generators(["processed/a.json"]) == []
+
+
+class TestIncrementalIndex:
+    """Tests that the output index is never rebuilt."""
+
+    def test_lookups_do_not_rebuild_index(self):
+        """Test that regeneration uses the index built at construction."""
+        gen = make_mock_generator("gen1", {"data": "processed/<doc>.json"})
+        manager = GeneratorManager(generators=[gen])
+        manager.output_index.register_generators = MagicMock()
+        manager.output_index.clear = MagicMock()
+
+        manager.regenerate_all()
+        manager.regenerate_affected(["processed/a.json"])
+        manager.find_affected_generators(["processed/b.json"])
+
+        manager.output_index.register_generators.assert_not_called()
+        manager.output_index.clear.assert_not_called()
@@ -1,5 +1,7 @@
 """Tests for TaskMerger."""
 
+import sys
+
 import pytest
 from unittest.mock import MagicMock
 
@@ -131,6 +133,52 @@ class TestTaskMergerDuplicates:
         assert len(result.updated) == 1
 
 
+    def test_same_instance_not_rehashed(self):
+        """Test that re-merging the same Task object skips hashing."""
+        merger = TaskMerger()
+        task = make_mock_task("task1", ["dep1"])
+
+        merger.merge([task])
+        task.dependencies[0].get_key.reset_mock()
+        result = merger.merge([task])
+
+        assert result.unchanged == ["task1"]
+        task.dependencies[0].get_key.assert_not_called()
+
+    def test_reordered_inputs_unchanged(self):
+        """Test that dependency order and duplicates don't count as changes."""
+        merger = TaskMerger()
+        task1 = make_mock_task("task1", ["dep1", "dep2"])
+        task2 = make_mock_task("task1", ["dep2", "dep1", "dep2"])
+
+        merger.merge([task1])
+        result = merger.merge([task2])
+
+        assert result.unchanged == ["task1"]
+        assert merger.entries["task1"].inputs == frozenset(["dep1", "dep2"])
+
+    def test_task_name_interned(self):
+        """Test that stored task names are interned."""
+        merger = TaskMerger()
+        name = "".join(["task", "1"])
+        merger.merge([make_mock_task(name, ["dep1"])])
+
+        assert next(iter(merger.entries)) is sys.intern("task1")
+
+    def test_legacy_string_dependency(self):
+        """Test fingerprinting dependencies without get_key()."""
+        merger = TaskMerger()
+        task1 = make_mock_task("task1", ["dep1"])
+        task1.dependencies.append("legacy")
+        task2 = make_mock_task("task1", ["dep1"])
+        task2.dependencies.append("other")
+
+        merger.merge([task1])
+        result = merger.merge([task2])
+
+        assert result.updated == [task2]
+
+
 class TestTaskMergerCompletedTasks:
     """Tests for completed task handling."""
 
@@ -147,6 +195,22 @@ class TestTaskMergerCompletedTasks:
         assert merger.is_completed("task1")
         assert merger.completed_count == 1
 
+    def test_completed_count_tracks_invalidation(self):
+        """Test the completed counter across repeat marks and updates."""
+        merger = TaskMerger()
+        merger.merge([make_mock_task("task1", ["dep1"])])
+
+        merger.mark_completed("task1")
+        merger.mark_completed("task1")
+        merger.mark_completed("unknown")
+        assert merger.completed_count == 1
+        assert merger.completed_tasks == {"task1"}
+
+        merger.merge([make_mock_task("task1", ["dep2"])])
+        assert merger.completed_count == 0
+        assert merger.completed_tasks == set()
+        assert merger.pending_count == 1
+
     def test_updated_completed_task_invalidated(self):
         """Test that updating a completed task invalidates it."""
         merger = TaskMerger()
@@ -9,6 +9,7 @@ import pytest
 
 from doit.exceptions import TaskError
 from doit.exceptions import BaseFail
+from doit.cmdparse import CmdParseError
 from doit import action
 from doit import task
 from doit.task import Stream
@@ -68,6 +69,27 @@ class TestTaskCheckInput(object):
         pytest.raises(task.InvalidTask, task.Task.check_attr, 'xxx',
                       'attr', True, ((list,), (False,)))
 
+    @pytest.mark.parametrize('attr, value', [
+        ('actions', 'echo'), ('uptodate', True), ('clean', False),
+        ('doc', 5), ('verbosity', 3), ('title', 'x'), ('meta', []),
+        ('dependencies', 'x'), ('calc_dep', 'x'), ('targets', 'x'),
+        ('outputs', 'x'), ('setup', 'x'), ('teardown', 'x'),
+        ('params', 'x'), ('pos_arg', 5), ('io', []), ('getargs', ['x']),
+        ('watch', 'x')])
+    def testInitArgumentChecked(self, attr, value):
+        with pytest.raises(task.InvalidTask) as exc_info:
+            task.Task('xxx', **{'actions': [], attr: value})
+        assert "attribute '%s' must be" % attr in str(exc_info.value)
+
+
+
+class TestTaskSlots(object):
+    def test_declared_attributes_in_slots(self):
+        t = task.Task('t', None)
+        assert vars(t) == {}
+        t.extra = 'plugin data'
+        assert vars(t) == {'extra': 'plugin data'}
+        assert t.name == 't'
 
 
 class TestTaskCompare(object):
@@ -143,6 +165,19 @@ class TestTaskInit(object):
         assert 2 == t.options['x']
         assert 2 == t.options['y']
 
+    def test_options_without_params(self):
+        t = task.Task("MyName", None)
+        t.cfg_values = {'x': 1}
+        assert [] == t.init_options([])
+        assert {} == t.options
+        # options are only initialized once
+        assert None is t.init_options(['--x=2'])
+        # with arguments, they are parsed even without params
+        t2 = task.Task("MyName", None)
+        assert ['pos'] == t2.init_options(['pos'])
+        pytest.raises(CmdParseError, task.Task("T", None).init_options,
+                      ['--x=2'])
+
     def test_setup(self):
         t = task.Task("task5", ['action'], setup=["task2"])
         assert ["task2"] == t.setup_tasks
@@ -251,6 +286,51 @@ class TestTaskDependencies(object):
         assert set(['calcX', 'calcY']) == my_task.calc_dep
         assert [(None, None, None), (True, None, None)] == my_task.uptodate
 
+    def test_add_task_dep_no_duplicates(self):
+        my_task = task.Task("Task X", ["taskcmd"],
+                            dependencies=[TaskDependency("t1")])
+        my_task.add_task_dep("t1")
+        my_task.add_task_dep("t2")
+        my_task.add_task_dep("t2")
+        # appended directly, e.g. by an uptodate object
+        my_task.dependencies.append(TaskDependency("t3"))
+        my_task.add_task_dep("t3")
+        assert ["t1", "t2", "t3"] == my_task.task_dep
+
+    def test_task_dep_after_remove_and_append(self):
+        my_task = task.Task("Task X", ["taskcmd"],
+                            dependencies=[TaskDependency("t1"),
+                                          FileDependency("f1")])
+        assert ["t1"] == my_task.task_dep
+        # same length, different last item
+        my_task.dependencies.pop()
+        my_task.dependencies.append(TaskDependency("t2"))
+        assert ["t1", "t2"] == my_task.task_dep
+        assert set() == my_task.file_dep
+        my_task.dependencies[-1] = FileDependency("f2")
+        assert ["t1"] == my_task.task_dep
+        assert {"f2"} == my_task.file_dep
+
+    def test_task_dep_returns_copy(self):
+        my_task = task.Task("Task X", ["taskcmd"],
+                            dependencies=[TaskDependency("t1")])
+        my_task.task_dep.append("t2")
+        my_task.file_dep.add("f1")
+        assert ["t1"] == my_task.task_dep
+        assert set() == my_task.file_dep
+        my_task.clear_task_deps()
+        assert [] == my_task.task_dep
+
+    def test_add_file_dep_after_clear(self):
+        my_task = task.Task("Task X", ["taskcmd"],
+                            dependencies=[FileDependency("f1")])
+        my_task.add_file_dep("f1")
+        assert 1 == len(my_task.file_dep)
+        my_task.clear_file_deps()
+        assert set() == my_task.file_dep
+        my_task.add_file_dep("f1")
+        assert 1 == len(my_task.file_dep)
+
 
 class TestTaskTargets(object):
     def test_targets_can_be_path(self):
@@ -572,6 +652,19 @@ class TestTaskClean(object):
         assert self.executed is True
         assert self.dryrun_val is False
 
+    def test_dryrun_unhashable_callable(self, tmpdir):
+        # callables that can't be cached are still inspected
+        calls = []
+        class Cleaner(object):
+            __hash__ = None
+            def __call__(self, dryrun):
+                calls.append(dryrun)
+        t = task.Task("xxx", None, targets=tmpdir['files'],
+                      clean=[(Cleaner(),)])
+        t.clean(StringIO(), dryrun=True)
+        t.clean(StringIO(), dryrun=True)
+        assert [True, True] == calls
+
 
 class TestTaskDoc(object):
     def test_no_doc(self):
@@ -594,6 +687,13 @@ class TestTaskDoc(object):
         t = task.Task("name", ["action"], doc="  \n  \n\n")
         assert "" == t.doc
 
+    def test_other_line_boundaries(self):
+        # same line boundaries as str.splitlines()
+        t = task.Task("name", ["action"], doc=" \r\n\x0c i am doc\rmore\n")
+        assert "i am doc" == t.doc
+        t = task.Task("name", ["action"], doc="i am doc\u2028more")
+        assert "i am doc" == t.doc
+
 
 class TestDictToTask(object):
     def testDictOkMinimum(self):
@@ -667,3 +767,19 @@ class TestResultDep(object):
         tasks['t1'].save_extra_values()
         dep_manager.save_success(tasks['t1'])
         assert 'up-to-date' == dep_manager.get_status(tasks['t1'], tasks).status
+
+    @pytest.mark.parametrize('setup_dep, expected_reads', [(False, 1),
+                                                           (True, 2)])
+    def test_saver_reuses_task_dep_result(self, setup_dep, expected_reads):
+        reads = []
+        def get_val(task_name, key):
+            reads.append(task_name)
+            return 'yes'
+        dep = task.result_dep('t2', setup_dep=setup_dep)
+        t1 = task.Task("t1", None, uptodate=[dep])
+        dep.get_val = get_val
+        dep.tasks_dict = {'t1': t1, 't2': task.Task("t2", None)}
+
+        assert not dep(t1, {})
+        assert {'_result:t2': 'yes'} == t1.value_savers[0]()
+        assert expected_reads == len(reads)